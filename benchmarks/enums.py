@@ -0,0 +1,66 @@
+import argparse
+import sys
+import timeit
+from typing import Any
+from typing import Callable
+from typing import List
+from typing import Optional
+
+from jdk.client.adoptium import AdoptiumArchitecture
+from jdk.client.corretto import CorrettoOperatingSystem
+from jdk.client.zulu import ZuluArchitecture
+from jdk.client.zulu import ZuluOperatingSystem
+from jdk.enums import Architecture
+from jdk.enums import OperatingSystem
+
+
+def _resolution_path() -> None:
+    # The enum work a URL resolution does for each vendor
+    for operating_system in OperatingSystem:
+        ZuluOperatingSystem.transform(operating_system)
+        CorrettoOperatingSystem.transform(operating_system)
+        operating_system in ZuluOperatingSystem
+    for arch in Architecture:
+        AdoptiumArchitecture.transform(arch)
+        ZuluArchitecture.transform(arch)
+        arch in AdoptiumArchitecture
+        hash(arch)
+        arch == AdoptiumArchitecture.X64
+    "bogus" in AdoptiumArchitecture
+
+
+def _exceptions_raised(func: Callable[[], Any]) -> int:
+    raised = 0
+
+    def trace(frame: Any, event: str, arg: Any) -> Optional[Callable[..., Any]]:
+        nonlocal raised
+        if event == "exception":
+            raised += 1
+        return trace
+
+    sys.settrace(trace)
+    try:
+        func()
+    finally:
+        sys.settrace(None)
+    return raised
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Time enum transforms and membership checks on the resolution path"
+    )
+    parser.add_argument("--number", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    best = min(timeit.repeat(_resolution_path, number=args.number, repeat=args.repeat))
+    print(f"resolution path: {best / args.number * 1e6:.2f} us per pass")
+
+    raised = _exceptions_raised(_resolution_path)
+    print(f"exceptions raised on the resolution path: {raised}")
+    return 1 if raised else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
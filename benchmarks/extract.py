@@ -0,0 +1,87 @@
+import argparse
+import os
+import shutil
+import sys
+import tarfile
+import tempfile
+import time
+import zipfile
+from os import path as ospath
+from typing import List
+from typing import Optional
+
+from jdk import extractor
+
+
+def _build_tree(root: str, files: int, large_size: int) -> str:
+    tree = ospath.join(root, "jdk-bench")
+    for index in range(files):
+        directory = ospath.join(tree, "lib", f"module{index % 50}")
+        os.makedirs(directory, exist_ok=True)
+        with open(ospath.join(directory, f"file{index}.class"), "wb") as f:
+            f.write(os.urandom(512) + bytes(3584))
+
+    os.makedirs(ospath.join(tree, "bin"), exist_ok=True)
+    with open(ospath.join(tree, "lib", "modules"), "wb") as f:
+        f.write(os.urandom(large_size // 2) + bytes(large_size - large_size // 2))
+    os.symlink("../lib/modules", ospath.join(tree, "bin", "modules"))
+    return tree
+
+
+def _build_archives(root: str, tree: str) -> List[str]:
+    tar_file = ospath.join(root, "jdk-bench.tar.gz")
+    with tarfile.open(tar_file, "w:gz") as tar:
+        tar.add(tree, arcname=ospath.basename(tree))
+
+    zip_file = ospath.join(root, "jdk-bench.zip")
+    with zipfile.ZipFile(zip_file, "w", zipfile.ZIP_DEFLATED) as z:
+        for directory, _, names in os.walk(tree):
+            for name in names:
+                file = ospath.join(directory, name)
+                if not ospath.islink(file):
+                    z.write(file, ospath.relpath(file, root))
+    return [tar_file, zip_file]
+
+
+def _time_extract(archive: str, workers: int, repeat: int, root: str) -> float:
+    best = None
+    ext = extractor.get_compressed_file_ext(archive)
+    for _ in range(repeat):
+        destination = tempfile.mkdtemp(dir=root)
+        start = time.perf_counter()
+        extractor.extract_files(archive, ext, destination, workers=workers)
+        elapsed = time.perf_counter() - start
+        shutil.rmtree(destination)
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Compare extractall with the parallel extraction modes"
+    )
+    parser.add_argument("--files", type=int, default=6000)
+    parser.add_argument("--large-size", type=int, default=30 * 1024 * 1024)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    root = tempfile.mkdtemp(prefix="jdk-extract-bench-")
+    try:
+        tree = _build_tree(root, args.files, args.large_size)
+        print(f"{args.files} files, {os.cpu_count()} CPUs, best of {args.repeat}")
+        for archive in _build_archives(root, tree):
+            serial = _time_extract(archive, 1, args.repeat, root)
+            parallel = _time_extract(archive, args.workers, args.repeat, root)
+            name = ospath.basename(archive)
+            print(
+                f"{name}: extractall {serial:.2f}s, "
+                f"{args.workers} workers {parallel:.2f}s ({serial / parallel:.2f}x)"
+            )
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
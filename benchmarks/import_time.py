@@ -0,0 +1,54 @@
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+from typing import List
+from typing import Optional
+
+
+_IMPORT_TIME = re.compile(r"import time:\s+\d+ \|\s+(\d+) \|\s*(\S+)")
+
+
+def _import_time(module: str) -> float:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    for line in result.stderr.splitlines():
+        match = _IMPORT_TIME.match(line)
+        if match and match.group(2) == module:
+            return int(match.group(1)) / 1000
+    raise RuntimeError(f"No import time reported for {module}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Measure the cumulative import time of jdk in fresh interpreters"
+    )
+    parser.add_argument("--module", default="jdk")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument(
+        "--max-ms",
+        type=float,
+        help="exit with an error when the median import time exceeds this budget",
+    )
+    args = parser.parse_args(argv)
+
+    times = [_import_time(args.module) for _ in range(args.repeat)]
+    median = statistics.median(times)
+    print(
+        f"import {args.module}: median {median:.1f} ms, "
+        f"min {min(times):.1f} ms over {args.repeat} runs"
+    )
+
+    if args.max_ms is not None and median > args.max_ms:
+        print(f"import {args.module} is over the {args.max_ms:.1f} ms budget")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,18 +1,53 @@
 import os
-import shutil
+import time
 from collections import namedtuple
 from os import path as ospath
-from subprocess import run  # noqa: S404 Security implication noted and mitigated
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Mapping
 from typing import Optional
+from typing import Tuple
 from typing import Union
 
 from jdk import extractor
+from jdk.checksum import HashingReader
+from jdk.checksum import discard
+from jdk.checksum import matches
 from jdk.client import load_client
+from jdk.client.client import ChecksumError
+from jdk.client.client import Client
+from jdk.client.client import ClientError
+from jdk.client.client import Resolution
+from jdk.client.client import create_client
+from jdk.client.client import temporary_file
 from jdk.enums import Architecture
 from jdk.enums import JvmImpl
 from jdk.enums import OperatingSystem
 from jdk.enums import Vendor
+from jdk.events import CHECKSUM
+from jdk.events import DEDUP
+from jdk.events import DOWNLOAD
+from jdk.events import EXTRACT
+from jdk.events import RESOLVE
+from jdk.events import UNPACK
+from jdk.events import EventCallback
+from jdk.events import InstallSummary
+from jdk.events import PhaseTimer
 from jdk.extension import deprecated
+from jdk.filelock import install_lock
+from jdk.filelock import publish_lock
+
+
+if TYPE_CHECKING:
+    from jdk.cache import ArchiveCache
+    from jdk.lockfile import LockedBuild
+    from jdk.lockfile import Lockfile
+    from jdk.registry import InstalledJdk
+    from jdk.registry import Registry
 
 
 _USER_DIR = ospath.expanduser("~")
@@ -24,11 +59,30 @@ ARCH = Architecture.detect()
 
 _IS_WINDOWS = OS == OperatingSystem.WINDOWS
 _UNPACK200 = "unpack200.exe" if _IS_WINDOWS else "unpack200"
-_UNPACK200_ARGS = '-r -v -l ""' if _IS_WINDOWS else ""
+_UNPACK200_ARGS = ["-r", "-v", "-l", ""] if _IS_WINDOWS else []
+_STAGING_PREFIX = ".staging-"
 
 
 _Path = namedtuple("_Path", "dir base name ext")
 
+InstallResult = namedtuple("InstallResult", "spec path error")
+
+# Named arguments of install that install_many and install_from_lock pass through
+_INSTALL_OPTIONS = frozenset(
+    (
+        "cache",
+        "stream",
+        "connections",
+        "retries",
+        "backoff_factor",
+        "extract_workers",
+        "dedup",
+        "verify",
+        "include",
+        "exclude",
+    )
+)
+
 
 class JdkError(Exception):
     pass
@@ -41,43 +95,345 @@ def _path_parse(file_path: str) -> _Path:
     return _Path(dir=dirname, base=base, name=name, ext=ext)
 
 
-def _unpack_jars(fs_path: str, java_bin_path: str) -> None:
-    if ospath.exists(fs_path):
-        if ospath.isdir(fs_path):
-            for f in os.listdir(fs_path):
-                current_path = ospath.join(fs_path, f)
-                _unpack_jars(current_path, java_bin_path)
+def _load_client(
+    vendor: Optional[Union[Vendor, str]], mirror: Optional[str] = None
+) -> Client:
+    try:
+        return create_client(vendor, mirror)
+    except ClientError as e:
+        raise JdkError(e) from e
+
+
+def _pack_files(fs_path: str) -> Iterator[str]:
+    directories = [fs_path]
+    while directories:
+        with os.scandir(directories.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    directories.append(entry.path)
+                elif entry.name.endswith(".pack") and entry.is_file():
+                    yield entry.path
+
+
+def _unpack_jar(tool_path: str, pack_file: str) -> None:
+    from subprocess import run  # noqa: S404 Security implication noted and mitigated
+
+    p = _path_parse(pack_file)
+    jar_file = ospath.join(p.dir, f"{p.name}.jar")
+    result = run(  # noqa: S603 Known arguments being passed into run
+        [tool_path, *_UNPACK200_ARGS, pack_file, jar_file],
+        capture_output=True,
+    )
+    if result.returncode != 0:
+        stderr = result.stderr.decode(errors="replace").strip()
+        raise JdkError(f"{_UNPACK200} failed for {pack_file}: {stderr}")
+    if ospath.exists(pack_file):
+        os.remove(pack_file)
+
+
+def _unpack_jars(
+    fs_path: str, java_bin_path: str, workers: Optional[int] = None
+) -> None:
+    if not ospath.isdir(fs_path):
+        return
+
+    pack_files = list(_pack_files(fs_path))
+    if not pack_files:
+        return
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    tool_path = ospath.join(java_bin_path, _UNPACK200)
+    # Each unpack200 call is its own process, so threads are enough to keep them busy
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        futures = [
+            executor.submit(_unpack_jar, tool_path, pack_file)
+            for pack_file in pack_files
+        ]
+        for future in futures:
+            future.result()
+
+
+def _staging_directory(destination_folder: str) -> str:
+    from tempfile import mkdtemp
+
+    os.makedirs(destination_folder, exist_ok=True)
+    # Staging next to the destination keeps the final rename on one filesystem
+    return mkdtemp(prefix=_STAGING_PREFIX, dir=destination_folder)
+
+
+def _publish(
+    staged_directory: str,
+    destination_folder: str,
+    dedup: bool = False,
+    timer: Optional[PhaseTimer] = None,
+) -> str:
+    from shutil import rmtree
+    from tempfile import mkdtemp
+
+    timer = timer or PhaseTimer()
+    with timer.phase(UNPACK):
+        jdk_bin = ospath.join(staged_directory, "bin")
+        _unpack_jars(staged_directory, jdk_bin)
+
+    jdk_name = ospath.basename(staged_directory)
+    jdk_directory = ospath.join(destination_folder, jdk_name)
+    # Archives from different vendors can unpack to the same directory name
+    with publish_lock(destination_folder, jdk_name):
+        if ospath.exists(jdk_directory):
+            # Move the old install aside so the new one appears in a single rename
+            old_directory = mkdtemp(prefix=_STAGING_PREFIX, dir=destination_folder)
+            os.replace(jdk_directory, ospath.join(old_directory, "old"))
+            os.replace(staged_directory, jdk_directory)
+            rmtree(old_directory, ignore_errors=True)
         else:
-            _, file_ext = ospath.splitext(fs_path)
-            if file_ext.endswith("pack"):
-                p = _path_parse(fs_path)
-                name = ospath.join(p.dir, p.name)
-                tool_path = ospath.join(java_bin_path, _UNPACK200)
-                run(  # noqa: S603 Known arguments being passed into run
-                    [tool_path, _UNPACK200_ARGS, f"{name}.pack", f"{name}.jar"]
-                )
+            os.replace(staged_directory, jdk_directory)
+
+    if dedup:
+        from jdk.dedup import dedupe
+
+        with timer.phase(DEDUP) as phase:
+            # The dedup phase reports the bytes it saved rather than bytes processed
+            phase.bytes = dedupe(jdk_directory, destination_folder).bytes_saved
+
+    return jdk_directory
 
 
 def _decompress_archive(
-    repo_root: str, file_ending: str, destination_folder: str
+    repo_root: str,
+    file_ending: str,
+    destination_folder: str,
+    workers: int = 1,
+    dedup: bool = False,
+    include: Optional[Union[str, Iterable[str]]] = None,
+    exclude: Optional[Union[str, Iterable[str]]] = None,
+    timer: Optional[PhaseTimer] = None,
 ) -> str:
-    if not ospath.exists(destination_folder):
-        os.mkdir(destination_folder)
+    from shutil import rmtree
 
     jdk_file = ospath.normpath(repo_root)
 
     if ospath.isfile(jdk_file):
-        jdk_directory = extractor.extract_files(
-            jdk_file, file_ending, destination_folder
-        )
-        jdk_bin = ospath.join(jdk_directory, "bin")
-        _unpack_jars(jdk_directory, jdk_bin)
-
-        return jdk_directory
+        timer = timer or PhaseTimer()
+        staging_folder = _staging_directory(destination_folder)
+        try:
+            with timer.phase(EXTRACT) as phase:
+                jdk_directory = extractor.extract_files(
+                    jdk_file,
+                    file_ending,
+                    staging_folder,
+                    workers=workers,
+                    include=include,
+                    exclude=exclude,
+                    progress=phase.progress,
+                )
+            return _publish(jdk_directory, destination_folder, dedup, timer)
+        finally:
+            rmtree(staging_folder, ignore_errors=True)
     elif ospath.isdir(jdk_file):
         return jdk_file
 
 
+def _stream_archive(
+    jdk_client: Client,
+    url: str,
+    destination_folder: str,
+    workers: int = 1,
+    dedup: bool = False,
+    checksum: Optional[str] = None,
+    include: Optional[Union[str, Iterable[str]]] = None,
+    exclude: Optional[Union[str, Iterable[str]]] = None,
+    timer: Optional[PhaseTimer] = None,
+) -> str:
+    from shutil import copyfileobj
+    from shutil import rmtree
+
+    timer = timer or PhaseTimer(url=url)
+    with jdk_client.open(url) as response:
+        jdk_file = jdk_client.get_file_name(response, url)
+        jdk_ext = extractor.get_compressed_file_ext(jdk_file)
+        reader = HashingReader(response)
+        if not extractor.can_stream(jdk_ext):
+            jdk_file = temporary_file(jdk_file)
+            try:
+                with timer.phase(DOWNLOAD) as phase, open(jdk_file, "wb") as out_file:
+                    copyfileobj(reader, out_file)
+                    phase.bytes = out_file.tell()
+                if checksum and not matches(reader.hexdigest(), checksum):
+                    raise ChecksumError(url, checksum, reader.hexdigest())
+                # Archives without a recognised extension are sniffed once on disk
+                jdk_ext = extractor.get_compressed_file_ext(jdk_file)
+                return _decompress_archive(
+                    jdk_file,
+                    jdk_ext,
+                    destination_folder,
+                    workers,
+                    dedup,
+                    include,
+                    exclude,
+                    timer,
+                )
+            finally:
+                os.remove(jdk_file)
+
+        staging_folder = _staging_directory(destination_folder)
+        try:
+            # The archive downloads as it is extracted, so both share one phase
+            with timer.phase(EXTRACT) as phase:
+                jdk_directory = extractor.extract_stream(
+                    reader,
+                    jdk_ext,
+                    staging_folder,
+                    include=include,
+                    exclude=exclude,
+                    progress=phase.progress,
+                )
+                # tarfile may stop before the end-of-archive padding, which is hashed
+                reader.drain()
+
+            if checksum and not matches(reader.hexdigest(), checksum):
+                raise ChecksumError(url, checksum, reader.hexdigest())
+
+            return _publish(jdk_directory, destination_folder, dedup, timer)
+        finally:
+            rmtree(staging_folder, ignore_errors=True)
+
+
+def _prefetched(url: str, checksum: Optional[str]) -> Optional["ArchiveCache"]:
+    from jdk.cache import ArchiveCache
+
+    # Archives prefetched into the default cache are used even without a cache
+    cache = ArchiveCache()
+    if checksum and cache.get(url, checksum):
+        return cache
+    return None
+
+
+def _cached_checksum(
+    jdk_client: Client, url: str, cache: Optional["ArchiveCache"]
+) -> Tuple[Optional["ArchiveCache"], Optional[str]]:
+    from jdk.cache import ArchiveCache
+
+    archives = cache or ArchiveCache()
+    entry = archives.lookup(url)
+    # While the URL's resolution is fresh, the archive cached for it is the same build
+    if entry and entry.checksum:
+        if time.time() - entry.stored < jdk_client.resolution_ttl:
+            return archives, entry.checksum
+    return cache, None
+
+
+def _install_url(
+    jdk_client: Client,
+    url: str,
+    path: str,
+    *,
+    cache: Optional["ArchiveCache"] = None,
+    stream: bool = False,
+    connections: int = 1,
+    retries: int = 0,
+    backoff_factor: float = 1.0,
+    extract_workers: int = 1,
+    dedup: bool = False,
+    verify: bool = True,
+    include: Optional[Union[str, Iterable[str]]] = None,
+    exclude: Optional[Union[str, Iterable[str]]] = None,
+    timer: Optional[PhaseTimer] = None,
+) -> str:
+    timer = timer or PhaseTimer(url=url)
+    jdk_file = None
+    try:
+        checksum = None
+        if verify:
+            cache, checksum = _cached_checksum(jdk_client, url, cache)
+        if verify and not checksum:
+            with timer.phase(CHECKSUM):
+                checksum = jdk_client.get_checksum(url)
+        if cache is None:
+            cache = _prefetched(url, checksum)
+
+        if stream and cache is None:
+            return _stream_archive(
+                jdk_client,
+                url,
+                path,
+                extract_workers,
+                dedup,
+                checksum,
+                include,
+                exclude,
+                timer,
+            )
+
+        with timer.phase(DOWNLOAD) as phase:
+            jdk_file = jdk_client.download(
+                url,
+                cache=cache,
+                checksum=checksum,
+                connections=connections,
+                retries=retries,
+                backoff_factor=backoff_factor,
+                progress=phase.progress,
+            )
+        jdk_ext = extractor.get_compressed_file_ext(jdk_file)
+        jdk_dir = _decompress_archive(
+            jdk_file, jdk_ext, path, extract_workers, dedup, include, exclude, timer
+        )
+        return jdk_dir
+    except Exception as e:
+        raise JdkError(e) from e
+    finally:
+        if jdk_file and cache is None:
+            discard(jdk_file)
+
+
+def _find_installed(registry: "Registry", *spec: Any) -> Optional["InstalledJdk"]:
+    from jdk.race import DEFAULT_VENDORS
+    from jdk.race import is_race
+
+    version, vendor, *rest = spec
+    # Any vendor that could win a race satisfies a request for the fastest one
+    for candidate in DEFAULT_VENDORS if is_race(vendor) else [vendor]:
+        installed = registry.find(version, candidate, *rest)
+        if installed:
+            return installed
+    return None
+
+
+def _is_filtered(options: Mapping[str, Any]) -> bool:
+    # A filtered install only holds part of the build, so it never satisfies another
+    return bool(options.get("include") or options.get("exclude"))
+
+
+def _install_registered(
+    jdk_client: Client,
+    url: str,
+    path: str,
+    spec: Tuple[Any, ...],
+    force: bool = False,
+    **options: Any,
+) -> str:
+    from jdk.registry import get_registry
+
+    registry = get_registry(path)
+    filtered = _is_filtered(options)
+    # Concurrent installs of the same archive wait here for the first one to finish
+    with install_lock(path, url):
+        if not force and not filtered:
+            installed = registry.find(*spec)
+            # A build registered from another archive is replaced rather than reused
+            if installed and installed.url == url:
+                return installed.path
+
+        jdk_dir = _install_url(jdk_client, url, path, **options)
+        if filtered:
+            # The full build that used to be in this directory has been replaced
+            registry.remove(jdk_dir)
+        else:
+            registry.add(*spec, jdk_dir, url)
+        return jdk_dir
+
+
 def install(
     version: str,
     operating_system: Union[OperatingSystem, str] = OS,
@@ -87,40 +443,311 @@ def install(
     path: str = None,
     *,
     vendor: Union[Vendor, str] = "Adoptium",
-) -> str:
-    jdk_client = load_client(vendor)()
+    cache: Optional["ArchiveCache"] = None,
+    stream: bool = False,
+    connections: int = 1,
+    retries: int = 0,
+    backoff_factor: float = 1.0,
+    extract_workers: int = 1,
+    dedup: bool = False,
+    verify: bool = True,
+    force: bool = False,
+    mirror: Optional[str] = None,
+    include: Optional[Union[str, Iterable[str]]] = None,
+    exclude: Optional[Union[str, Iterable[str]]] = None,
+    events: Optional[EventCallback] = None,
+    summary: bool = False,
+) -> Union[str, InstallSummary]:
+    from jdk.race import is_race
+    from jdk.race import race
+    from jdk.registry import get_registry
+
+    if not path:
+        path = _JRE_DIR if jre else _JDK_DIR
+
+    # Bad filters are reported before anything is resolved or downloaded
+    extractor.member_filter(include, exclude)
+    timer = PhaseTimer(events)
+    registry = get_registry(path)
+    if not force and not (include or exclude):
+        installed = _find_installed(
+            registry, version, vendor, operating_system, arch, impl, jre
+        )
+        if installed:
+            timer.url = installed.url
+            return timer.summary(installed.path) if summary else installed.path
+
+    with timer.phase(RESOLVE):
+        if is_race(vendor):
+            winner = race(version, operating_system, arch, impl, jre, mirror=mirror)
+            jdk_client, url, vendor = winner.client, winner.url, winner.vendor
+        else:
+            jdk_client = _load_client(vendor, mirror)
+            url = jdk_client.get_download_url(
+                version, operating_system, arch, impl, jre
+            )
+        # Set before the phase ends so its end event carries the resolved URL
+        timer.url = url
+
+    jdk_dir = _install_registered(
+        jdk_client,
+        url,
+        path,
+        (version, vendor, operating_system, arch, impl, jre),
+        force,
+        cache=cache,
+        stream=stream,
+        connections=connections,
+        retries=retries,
+        backoff_factor=backoff_factor,
+        extract_workers=extract_workers,
+        dedup=dedup,
+        verify=verify,
+        include=include,
+        exclude=exclude,
+        timer=timer,
+    )
+    return timer.summary(jdk_dir) if summary else jdk_dir
+
+
+def find_installed(
+    version: str,
+    vendor: Union[Vendor, str] = "Adoptium",
+    operating_system: Union[OperatingSystem, str] = OS,
+    arch: Union[Architecture, str] = ARCH,
+    impl: Union[JvmImpl, str] = JvmImpl.HOTSPOT,
+    jre: bool = False,
+    path: Optional[str] = None,
+) -> Optional["InstalledJdk"]:
+    from jdk.registry import get_registry
+
+    if not path:
+        path = _JRE_DIR if jre else _JDK_DIR
+    registry = get_registry(path)
+    return _find_installed(registry, version, vendor, operating_system, arch, impl, jre)
+
 
-    url = jdk_client.get_download_url(version, operating_system, arch, impl, jre)
+def list_installed(
+    jre: bool = False, path: Optional[str] = None
+) -> List["InstalledJdk"]:
+    from jdk.registry import get_registry
 
     if not path:
         path = _JRE_DIR if jre else _JDK_DIR
+    return get_registry(path).entries()
 
-    jdk_file = None
-    try:
-        jdk_file = jdk_client.download(url)
-        jdk_ext = extractor.get_compressed_file_ext(jdk_file)
-        jdk_dir = _decompress_archive(jdk_file, jdk_ext, path)
-        return jdk_dir
-    except Exception as e:
-        raise JdkError(e) from e
-    finally:
-        if jdk_file:
-            os.remove(jdk_file)
+
+def _spec_args(
+    spec: Union[str, Mapping[str, Any]], mirror: Optional[str] = None
+) -> Dict[str, Any]:
+    if isinstance(spec, str):
+        spec = {"version": spec}
+
+    spec = dict(spec)
+    jre = spec.get("jre", False)
+    return {
+        "version": spec["version"],
+        "operating_system": spec.get("operating_system", OS),
+        "arch": spec.get("arch", ARCH),
+        "impl": spec.get("impl", JvmImpl.HOTSPOT),
+        "jre": jre,
+        "path": ospath.abspath(spec.get("path") or (_JRE_DIR if jre else _JDK_DIR)),
+        "vendor": spec.get("vendor", "Adoptium"),
+        "mirror": spec.get("mirror", mirror),
+    }
+
+
+def _registry_args(args: Dict[str, Any]) -> Tuple[Any, ...]:
+    return (
+        args["version"],
+        args["vendor"],
+        args["operating_system"],
+        args["arch"],
+        args["impl"],
+        args["jre"],
+    )
+
+
+def _resolve_spec(args: Dict[str, Any]) -> Tuple[Client, str]:
+    from jdk.race import is_race
+    from jdk.race import race
+
+    if is_race(args["vendor"]):
+        version, _, *build = _registry_args(args)
+        winner = race(version, *build, mirror=args["mirror"])
+        # Register the install under the vendor that won
+        args["vendor"] = winner.vendor
+        return winner.client, winner.url
+
+    jdk_client = _load_client(args["vendor"], args["mirror"])
+    url = jdk_client.get_download_url(
+        args["version"],
+        args["operating_system"],
+        args["arch"],
+        args["impl"],
+        args["jre"],
+    )
+    return jdk_client, url
+
+
+def _resolved(
+    specs: List[Any], resolutions: Dict[int, Any], results: List[Any]
+) -> Iterator[Tuple[int, Client, str]]:
+    for index, resolution in resolutions.items():
+        try:
+            jdk_client, url = resolution.result()
+        except Exception as e:
+            results[index] = InstallResult(specs[index], None, JdkError(e))
+            continue
+        yield index, jdk_client, url
+
+
+def _check_options(function: str, options: Dict[str, Any]) -> None:
+    unknown = sorted(set(options) - _INSTALL_OPTIONS)
+    if unknown:
+        raise TypeError(
+            f"{function}() got an unexpected keyword argument {unknown[0]!r}"
+        )
+    extractor.member_filter(options.get("include"), options.get("exclude"))
+
+
+def _installed_result(
+    spec: Any,
+    installed: "InstalledJdk",
+    events: Optional[EventCallback],
+    summary: bool,
+) -> InstallResult:
+    if summary:
+        timer = PhaseTimer(events, installed.url)
+        return InstallResult(spec, timer.summary(installed.path), None)
+    return InstallResult(spec, installed.path, None)
+
+
+def _register(args: Dict[str, Any], jdk_dir: str, url: str) -> None:
+    from jdk.registry import get_registry
+
+    registry = get_registry(args["path"])
+    installed = registry.find(*_registry_args(args))
+    if not installed or installed.path != jdk_dir:
+        registry.add(*_registry_args(args), jdk_dir, url)
+
+
+def _install_resolved(
+    executor: Any,
+    specs: List[Any],
+    spec_args: List[Dict[str, Any]],
+    resolved: Iterable[Tuple[int, Client, str]],
+    results: List[Any],
+    force: bool,
+    events: Optional[EventCallback],
+    summary: bool,
+    options: Dict[str, Any],
+) -> None:
+    installs = {}
+    pending = {}
+    for index, jdk_client, url in resolved:
+        # Specs that resolve to the same archive and destination share one install
+        key = (url, spec_args[index]["path"])
+        if key not in installs:
+            timer = PhaseTimer(events, url)
+            future = executor.submit(
+                _install_registered,
+                jdk_client,
+                url,
+                key[1],
+                _registry_args(spec_args[index]),
+                force,
+                timer=timer,
+                **options,
+            )
+            installs[key] = (future, timer)
+        pending[index] = (*installs[key], url)
+
+    for index, (install_future, timer, url) in pending.items():
+        args = spec_args[index]
+        try:
+            jdk_dir = install_future.result()
+            # Specs that shared an install still need their own registry entry
+            if not _is_filtered(options):
+                _register(args, jdk_dir, url)
+            result = timer.summary(jdk_dir) if summary else jdk_dir
+            results[index] = InstallResult(specs[index], result, None)
+        except Exception as e:
+            results[index] = InstallResult(specs[index], None, e)
+
+
+def install_many(
+    specs: Iterable[Union[str, Mapping[str, Any]]],
+    max_workers: Optional[int] = None,
+    *,
+    force: bool = False,
+    mirror: Optional[str] = None,
+    events: Optional[EventCallback] = None,
+    summary: bool = False,
+    **options: Any,
+) -> List[InstallResult]:
+    from concurrent.futures import ThreadPoolExecutor
+
+    from jdk.registry import get_registry
+
+    _check_options("install_many", options)
+    specs = list(specs)
+    results = [None] * len(specs)
+    spec_args = [None] * len(specs)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        resolutions = {}
+        for index, spec in enumerate(specs):
+            try:
+                args = spec_args[index] = _spec_args(spec, mirror)
+            except Exception as e:
+                results[index] = InstallResult(spec, None, JdkError(e))
+                continue
+
+            installed = None
+            if not force and not _is_filtered(options):
+                registry = get_registry(args["path"])
+                installed = _find_installed(registry, *_registry_args(args))
+            if installed:
+                results[index] = _installed_result(spec, installed, events, summary)
+            else:
+                resolutions[index] = executor.submit(_resolve_spec, args)
+
+        resolved = _resolved(specs, resolutions, results)
+        _install_resolved(
+            executor,
+            specs,
+            spec_args,
+            resolved,
+            results,
+            force,
+            events,
+            summary,
+            options,
+        )
+
+    return results
 
 
 @deprecated(
     "Manually delete from the .jre or .jdk directory. Will be removed in a future version"
 )
 def uninstall(version: str, jre: bool = False):
+    from shutil import rmtree
+
+    from jdk.registry import get_registry
+
     version = f"jdk{version}"
     if jre:
         versions = (v for v in os.listdir(_JRE_DIR) if version in v.replace("-", ""))
         for v in versions:
-            shutil.rmtree(ospath.join(_JRE_DIR, v))
+            rmtree(ospath.join(_JRE_DIR, v))
+        get_registry(_JRE_DIR).prune()
     else:
         versions = (v for v in os.listdir(_JDK_DIR) if version in v.replace("-", ""))
         for v in versions:
-            shutil.rmtree(ospath.join(_JDK_DIR, v))
+            rmtree(ospath.join(_JDK_DIR, v))
+        get_registry(_JDK_DIR).prune()
 
 
 def get_download_url(
@@ -131,11 +758,196 @@ def get_download_url(
     jre: bool = False,
     *,
     vendor: Union[Vendor, str] = "Adoptium",
+    mirror: Optional[str] = None,
 ) -> Optional[str]:
-    jdk_client = load_client(vendor)()
+    from jdk.race import is_race
+    from jdk.race import race
+
+    if is_race(vendor):
+        return race(version, operating_system, arch, impl, jre, mirror=mirror).url
+
+    jdk_client = _load_client(vendor, mirror)
     return jdk_client.get_download_url(version, operating_system, arch, impl, jre)
 
 
+def resolve_many(
+    specs: Iterable[Union[str, Mapping[str, Any]]],
+    max_workers: Optional[int] = None,
+    *,
+    vendor: Union[Vendor, str] = "Adoptium",
+    mirror: Optional[str] = None,
+) -> List[Resolution]:
+    jdk_client = _load_client(vendor, mirror)
+    return jdk_client.resolve_many(specs, max_workers)
+
+
+def _resolution_spec(args: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "version": args["version"],
+        "operating_system": args["operating_system"],
+        "arch": args["arch"],
+        "impl": args["impl"],
+        "jre": args["jre"],
+    }
+
+
+def _resolve_race(args: Dict[str, Any]) -> Resolution:
+    spec = _resolution_spec(args)
+    try:
+        jdk_client, url = _resolve_spec(args)
+        return Resolution(spec, url, jdk_client.get_checksum(url), None, None)
+    except Exception as e:
+        return Resolution(spec, None, None, None, e)
+
+
+def _lock_build(args: Dict[str, Any], resolution: Resolution) -> "LockedBuild":
+    from jdk.lockfile import locked_build
+    from jdk.lockfile import resolve_download
+
+    if resolution.error:
+        raise resolution.error
+
+    url, size = resolution.url, resolution.size
+    if size is None:
+        # Builds without a listed size sit behind links such as /latest/ that move
+        url, size = resolve_download(url)
+    return locked_build(args, url, resolution.checksum, size)
+
+
+def _resolve_batch(
+    vendor: Union[Vendor, str],
+    mirror: Optional[str],
+    spec_args: List[Dict[str, Any]],
+    max_workers: Optional[int],
+) -> List[Resolution]:
+    specs = [_resolution_spec(args) for args in spec_args]
+    try:
+        jdk_client = _load_client(vendor, mirror)
+    except Exception as e:
+        return [Resolution(spec, None, None, None, e) for spec in specs]
+    # Each vendor resolves its builds in one batch where it can
+    return jdk_client.resolve_many(specs, max_workers)
+
+
+def _lock_resolutions(
+    executor: Any, spec_args: List[Dict[str, Any]], max_workers: Optional[int]
+) -> List[Resolution]:
+    from jdk.race import is_race
+
+    vendors: Dict[Tuple[Any, Any], List[int]] = {}
+    for index, args in enumerate(spec_args):
+        vendors.setdefault((args["vendor"], args["mirror"]), []).append(index)
+
+    races = {}
+    batches = {}
+    for (vendor, vendor_mirror), indexes in vendors.items():
+        if is_race(vendor):
+            for index in indexes:
+                races[index] = executor.submit(_resolve_race, spec_args[index])
+        else:
+            batches[tuple(indexes)] = executor.submit(
+                _resolve_batch,
+                vendor,
+                vendor_mirror,
+                [spec_args[index] for index in indexes],
+                max_workers,
+            )
+
+    resolutions = [None] * len(spec_args)
+    for index, future in races.items():
+        resolutions[index] = future.result()
+    for indexes, future in batches.items():
+        for index, resolution in zip(indexes, future.result()):
+            resolutions[index] = resolution
+    return resolutions
+
+
+def lock(
+    specs: Iterable[Union[str, Mapping[str, Any]]],
+    max_workers: Optional[int] = None,
+    *,
+    mirror: Optional[str] = None,
+) -> "Lockfile":
+    from concurrent.futures import ThreadPoolExecutor
+
+    from jdk.lockfile import Lockfile
+
+    specs = list(specs)
+    spec_args = [_spec_args(spec, mirror) for spec in specs]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        resolutions = _lock_resolutions(executor, spec_args, max_workers)
+        locked = [
+            executor.submit(_lock_build, args, resolution)
+            for args, resolution in zip(spec_args, resolutions)
+        ]
+
+    builds = []
+    errors = []
+    for spec, future in zip(specs, locked):
+        try:
+            builds.append(future.result())
+        except Exception as e:
+            errors.append(f"{spec}: {e}")
+    if errors:
+        raise JdkError(f"Could not lock {len(errors)} build(s) ({'; '.join(errors)})")
+    return Lockfile(builds)
+
+
+def install_from_lock(
+    lockfile: Union["Lockfile", str],
+    max_workers: Optional[int] = None,
+    *,
+    path: Optional[str] = None,
+    force: bool = False,
+    events: Optional[EventCallback] = None,
+    summary: bool = False,
+    **options: Any,
+) -> List[InstallResult]:
+    from concurrent.futures import ThreadPoolExecutor
+
+    from jdk.lockfile import LockedClient
+    from jdk.lockfile import read_lockfile
+    from jdk.registry import get_registry
+
+    _check_options("install_from_lock", options)
+    if isinstance(lockfile, str):
+        lockfile = read_lockfile(lockfile)
+
+    builds = list(lockfile.builds)
+    jdk_client = LockedClient(builds)
+    results = [None] * len(builds)
+    spec_args = [None] * len(builds)
+    resolved = []
+    for index, build in enumerate(builds):
+        args = spec_args[index] = build._asdict()
+        args["path"] = ospath.abspath(path or (_JRE_DIR if build.jre else _JDK_DIR))
+
+        installed = None
+        if not force and not _is_filtered(options):
+            registry = get_registry(args["path"])
+            installed = registry.find(*_registry_args(args))
+        # Only the exact archive that was locked satisfies the build
+        if installed and installed.url == build.url:
+            results[index] = _installed_result(build, installed, events, summary)
+        else:
+            resolved.append((index, jdk_client, build.url))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        _install_resolved(
+            executor,
+            builds,
+            spec_args,
+            resolved,
+            results,
+            force,
+            events,
+            summary,
+            options,
+        )
+
+    return results
+
+
 def download(
     download_url: Optional[str] = None,
     *,
@@ -145,11 +957,34 @@ def download(
     impl: Union[JvmImpl, str] = JvmImpl.HOTSPOT,
     jre: bool = False,
     vendor: Union[Vendor, str] = "Adoptium",
+    cache: Optional["ArchiveCache"] = None,
+    connections: int = 1,
+    retries: int = 0,
+    backoff_factor: float = 1.0,
+    verify: bool = True,
+    mirror: Optional[str] = None,
 ) -> Optional[str]:
-    jdk_client = load_client(vendor)()
+    from jdk.race import is_race
+    from jdk.race import race
+
+    if is_race(vendor):
+        # The race only picks the vendor, the archive downloads like any other
+        winner = race(version, operating_system, arch, impl, jre, mirror=mirror)
+        jdk_client = winner.client
+        download_url = download_url or winner.url
+    else:
+        jdk_client = _load_client(vendor, mirror)
 
     if not download_url:
         download_url = jdk_client.get_download_url(
             version, operating_system, arch, impl, jre
         )
-    return jdk_client.download(download_url)
+    checksum = jdk_client.get_checksum(download_url) if verify else None
+    return jdk_client.download(
+        download_url,
+        cache=cache,
+        checksum=checksum,
+        connections=connections,
+        retries=retries,
+        backoff_factor=backoff_factor,
+    )
@@ -0,0 +1,121 @@
+import argparse
+import sys
+from typing import List
+from typing import Optional
+
+
+def _mirror(args: argparse.Namespace) -> int:
+    from jdk.mirror import mirror
+
+    entries = mirror(
+        args.directory,
+        args.versions,
+        vendors=args.vendors or ["Adoptium"],
+        operating_systems=args.operating_systems,
+        architectures=args.architectures,
+        jre=args.jre,
+        max_workers=args.workers,
+    )
+
+    failed = 0
+    for entry in entries:
+        build = f"{entry.vendor} {entry.version} {entry.operating_system} {entry.arch}"
+        if entry.error:
+            failed += 1
+            print(f"{build}: {entry.error}", file=sys.stderr)
+        else:
+            print(f"{build}: {entry.path}")
+    return 1 if failed else 0
+
+
+def _prefetch(args: argparse.Namespace) -> int:
+    from jdk.cache import ArchiveCache
+    from jdk.prefetch import DEFAULT_INTERVAL
+    from jdk.prefetch import lower_priority
+    from jdk.prefetch import watch
+
+    # Prefetching yields CPU and disk to the installs it is warming the cache for
+    lower_priority()
+    rounds = watch(
+        args.versions,
+        args.vendors or ["Adoptium"],
+        args.operating_systems,
+        args.architectures,
+        args.jre,
+        cache=ArchiveCache(args.cache_dir),
+        mirror=args.mirror,
+        max_workers=args.workers,
+        interval=DEFAULT_INTERVAL if args.interval is None else args.interval,
+        rounds=None if args.watch else 1,
+    )
+
+    failed = 0
+    try:
+        for entries in rounds:
+            failed = 0
+            for entry in entries:
+                build = (
+                    f"{entry.vendor} {entry.version} {entry.operating_system} "
+                    f"{entry.arch}"
+                )
+                if entry.error:
+                    failed += 1
+                    print(f"{build}: {entry.error}", file=sys.stderr)
+                elif entry.fetched:
+                    print(f"{build}: fetched {entry.path}", flush=True)
+                else:
+                    print(f"{build}: cached {entry.path}", flush=True)
+    except KeyboardInterrupt:
+        return 0
+    return 1 if failed else 0
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m jdk")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    mirror = commands.add_parser(
+        "mirror", help="download archives and metadata into a static mirror"
+    )
+    mirror.add_argument("directory", help="mirror root to serve over HTTP")
+    mirror.add_argument(
+        "-v", "--version", dest="versions", action="append", required=True
+    )
+    mirror.add_argument("--vendor", dest="vendors", action="append")
+    mirror.add_argument("--os", dest="operating_systems", action="append")
+    mirror.add_argument("--arch", dest="architectures", action="append")
+    mirror.add_argument("--jre", action="store_true")
+    mirror.add_argument("--workers", type=int)
+    mirror.set_defaults(func=_mirror)
+
+    prefetch = commands.add_parser(
+        "prefetch", help="download the newest builds into the archive cache"
+    )
+    prefetch.add_argument(
+        "-v", "--version", dest="versions", action="append", required=True
+    )
+    prefetch.add_argument("--vendor", dest="vendors", action="append")
+    prefetch.add_argument("--os", dest="operating_systems", action="append")
+    prefetch.add_argument("--arch", dest="architectures", action="append")
+    prefetch.add_argument("--jre", action="store_true")
+    prefetch.add_argument("--workers", type=int)
+    prefetch.add_argument("--mirror", help="base URL of an offline mirror")
+    prefetch.add_argument("--cache-dir", help="archive cache directory")
+    prefetch.add_argument(
+        "--watch", action="store_true", help="keep re-resolving the builds"
+    )
+    prefetch.add_argument(
+        "--interval", type=float, help="seconds between rounds with --watch"
+    )
+    prefetch.set_defaults(func=_prefetch)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,373 @@
+import json
+import os
+import time
+from collections import OrderedDict
+from collections import namedtuple
+from hashlib import sha256
+from os import path as ospath
+from threading import RLock
+from threading import get_ident
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from jdk.checksum import digest_file
+from jdk.checksum import get_digest
+from jdk.checksum import matches
+from jdk.filelock import FileLock
+
+
+if TYPE_CHECKING:
+    from jdk.client.client import Client
+
+
+_USER_DIR = ospath.expanduser("~")
+_CACHE_DIR = ospath.join(_USER_DIR, ".install-jdk")
+_ARCHIVE_CACHE_DIR = ospath.join(_CACHE_DIR, "archives")
+_METADATA_CACHE_DIR = ospath.join(_CACHE_DIR, "metadata")
+_RESOLUTION_CACHE_DIR = ospath.join(_CACHE_DIR, "resolutions")
+_ENTRY_FILE = "entry.json"
+
+# Large enough to hold a handful of JDK bundles for a couple of vendors
+DEFAULT_MAX_SIZE = 2 * 1024 * 1024 * 1024
+DEFAULT_METADATA_TTL = 60 * 60
+DEFAULT_RESOLUTION_TTL = 60 * 60
+DEFAULT_MAX_RESOLUTIONS = 256
+
+
+CacheEntry = namedtuple("CacheEntry", "key url checksum file size last_access stored")
+
+
+class CacheError(Exception):
+    pass
+
+
+def _write_atomic(file: str, data: bytes) -> None:
+    tmp_file = f"{file}.{os.getpid()}.{get_ident()}.tmp"
+    with open(tmp_file, "wb") as f:
+        f.write(data)
+    os.replace(tmp_file, file)
+
+
+def _cache_key(url: str) -> str:
+    return sha256(url.encode("utf-8")).hexdigest()
+
+
+class ArchiveCache:
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_size: Optional[int] = DEFAULT_MAX_SIZE,
+    ) -> None:
+        self.cache_dir = cache_dir or _ARCHIVE_CACHE_DIR
+        self.max_size = max_size
+        self._lock = RLock()
+
+    def _entry_dir(self, key: str) -> str:
+        return ospath.join(self.cache_dir, key)
+
+    def _read_entry(self, key: str) -> Optional[CacheEntry]:
+        entry_file = ospath.join(self._entry_dir(key), _ENTRY_FILE)
+        try:
+            with open(entry_file) as f:
+                data = json.load(f)
+            archive = ospath.join(self._entry_dir(key), data["file"])
+            size = ospath.getsize(archive)
+            last_access = ospath.getmtime(entry_file)
+        except (OSError, ValueError, KeyError):
+            return None
+        return CacheEntry(
+            key=key,
+            url=data.get("url"),
+            checksum=data.get("checksum"),
+            file=archive,
+            size=size,
+            last_access=last_access,
+            stored=data.get("stored", last_access),
+        )
+
+    def lookup(self, url: str, checksum: Optional[str] = None) -> Optional[CacheEntry]:
+        key = _cache_key(url)
+        with self._lock:
+            entry = self._read_entry(key)
+            if entry is None:
+                return None
+            # A URL such as a /latest/ link can be cached again for a newer build
+            if checksum and not matches(
+                entry.checksum or get_digest(entry.file), checksum
+            ):
+                return None
+            # The entry file mtime doubles as the LRU timestamp
+            os.utime(ospath.join(self._entry_dir(key), _ENTRY_FILE))
+            return entry
+
+    def get(self, url: str, checksum: Optional[str] = None) -> Optional[str]:
+        entry = self.lookup(url, checksum)
+        return entry.file if entry else None
+
+    def put(self, url: str, file: str, checksum: Optional[str] = None) -> str:
+        from shutil import move
+        from shutil import rmtree
+        from tempfile import mkdtemp
+
+        key = _cache_key(url)
+        entry_dir = self._entry_dir(key)
+        with self._lock:
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                tmp_dir = mkdtemp(suffix=".tmp", dir=self.cache_dir)
+            except OSError as e:
+                raise CacheError(e) from e
+            try:
+                file_name = ospath.basename(file)
+                move(file, ospath.join(tmp_dir, file_name))
+                if ospath.exists(digest_file(file)):
+                    move(
+                        digest_file(file), digest_file(ospath.join(tmp_dir, file_name))
+                    )
+                with open(ospath.join(tmp_dir, _ENTRY_FILE), "w") as f:
+                    entry = {"url": url, "checksum": checksum, "file": file_name}
+                    entry["stored"] = time.time()
+                    json.dump(entry, f)
+                # Caches in other threads or processes may replace the same entry
+                with FileLock(f"{entry_dir}.lock", delete=True):
+                    rmtree(entry_dir, ignore_errors=True)
+                    os.rename(tmp_dir, entry_dir)
+            except OSError as e:
+                rmtree(tmp_dir, ignore_errors=True)
+                raise CacheError(e) from e
+
+            self.prune(keep=key)
+            return ospath.join(entry_dir, file_name)
+
+    def entries(self) -> List[CacheEntry]:
+        if not ospath.isdir(self.cache_dir):
+            return []
+
+        entries = []
+        with self._lock:
+            for key in os.listdir(self.cache_dir):
+                if key.endswith((".tmp", ".lock")):
+                    continue
+                entry = self._read_entry(key)
+                if entry is not None:
+                    entries.append(entry)
+        return sorted(entries, key=lambda e: e.last_access, reverse=True)
+
+    def size(self) -> int:
+        return sum(entry.size for entry in self.entries())
+
+    def remove(self, url: str, checksum: Optional[str] = None) -> bool:
+        from shutil import rmtree
+
+        entry_dir = self._entry_dir(_cache_key(url))
+        with self._lock:
+            if checksum and self.lookup(url, checksum) is None:
+                return False
+            if ospath.isdir(entry_dir):
+                rmtree(entry_dir)
+                return True
+        return False
+
+    def prune(
+        self,
+        max_size: Optional[int] = None,
+        max_age: Optional[float] = None,
+        *,
+        keep: Optional[str] = None,
+    ) -> List[CacheEntry]:
+        from shutil import rmtree
+
+        if max_size is None:
+            max_size = self.max_size
+
+        removed = []
+        with self._lock:
+            total = 0
+            now = time.time()
+            for entry in self.entries():
+                expired = max_age is not None and now - entry.last_access > max_age
+                oversized = max_size is not None and total + entry.size > max_size
+                if entry.key != keep and (expired or oversized):
+                    rmtree(self._entry_dir(entry.key), ignore_errors=True)
+                    removed.append(entry)
+                else:
+                    total += entry.size
+        return removed
+
+    def clear(self) -> None:
+        from shutil import rmtree
+
+        with self._lock:
+            rmtree(self.cache_dir, ignore_errors=True)
+
+    def warm(
+        self,
+        url: str,
+        checksum: Optional[str] = None,
+        *,
+        client: Optional["Client"] = None,
+    ) -> str:
+        cached = self.get(url, checksum)
+        if cached:
+            return cached
+
+        if client is None:
+            from jdk.client.client import Client
+
+            client = Client(None)
+        return client.download(url, cache=self, checksum=checksum)
+
+
+def _conditional_get(
+    url: str, body: Optional[bytes], meta: Dict[str, Any]
+) -> Tuple[Optional[bytes], Dict[str, Any]]:
+    from urllib.error import HTTPError
+
+    from jdk.client.pool import urlopen
+
+    headers = {"User-Agent": "Mozilla/5.0"}
+    if body is not None and meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if body is not None and meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+
+    try:
+        with urlopen(url, headers=headers) as response:
+            return response.read(), {
+                "url": url,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+            }
+    except HTTPError as e:
+        # Not modified, so the cached body is kept and only its age is reset
+        if e.code != 304 or body is None:
+            raise
+        return None, meta
+
+
+class MetadataCache:
+    def __init__(
+        self, cache_dir: Optional[str] = None, ttl: float = DEFAULT_METADATA_TTL
+    ) -> None:
+        self.cache_dir = cache_dir or _METADATA_CACHE_DIR
+        self.ttl = ttl
+
+    def _files(self, url: str) -> Tuple[str, str]:
+        key = _cache_key(url)
+        return (
+            ospath.join(self.cache_dir, f"{key}.body"),
+            ospath.join(self.cache_dir, f"{key}.json"),
+        )
+
+    def _read(self, url: str) -> Tuple[Optional[bytes], Dict[str, Any]]:
+        body_file, meta_file = self._files(url)
+        try:
+            with open(meta_file) as f:
+                meta = json.load(f)
+            with open(body_file, "rb") as f:
+                return f.read(), meta
+        except (OSError, ValueError):
+            return None, {}
+
+    def _store(self, url: str, body: Optional[bytes], meta: Dict[str, Any]) -> None:
+        body_file, meta_file = self._files(url)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        if body is not None:
+            _write_atomic(body_file, body)
+        meta["fetched"] = time.time()
+        _write_atomic(meta_file, json.dumps(meta).encode("utf-8"))
+
+    def fetch(self, url: str, ttl: Optional[float] = None) -> bytes:
+        if ttl is None:
+            ttl = self.ttl
+
+        body, meta = self._read(url)
+        if body is not None and time.time() - meta.get("fetched", 0) < ttl:
+            return body
+
+        from urllib.error import HTTPError
+        from urllib.error import URLError
+
+        try:
+            new_body, meta = _conditional_get(url, body, meta)
+        except HTTPError:
+            raise
+        except URLError:
+            # Serve the stale copy rather than failing when offline
+            if body is None:
+                raise
+            return body
+
+        self._store(url, new_body, meta)
+        return body if new_body is None else new_body
+
+    def fetch_json(self, url: str, ttl: Optional[float] = None) -> Any:
+        return json.loads(self.fetch(url, ttl).decode("utf-8"))
+
+    def clear(self) -> None:
+        from shutil import rmtree
+
+        rmtree(self.cache_dir, ignore_errors=True)
+
+
+class ResolutionCache:
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_RESOLUTIONS,
+        cache_dir: Optional[str] = None,
+        *,
+        persistent: bool = False,
+    ) -> None:
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir or (_RESOLUTION_CACHE_DIR if persistent else None)
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = RLock()
+
+    def _file(self, key: str) -> str:
+        return ospath.join(self.cache_dir, f"{_cache_key(key)}.json")
+
+    def _remember(self, key: str, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        if entry is None and self.cache_dir:
+            try:
+                with open(self._file(key)) as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                return None
+            if entry.get("key") != key:
+                return None
+            self._remember(key, entry)
+
+        if entry is None or entry["expires"] <= time.time():
+            return None
+        return entry["value"]
+
+    def put(self, key: str, value: Dict[str, Any], ttl: float) -> None:
+        entry = {"key": key, "value": value, "expires": time.time() + ttl}
+        self._remember(key, entry)
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            _write_atomic(self._file(key), json.dumps(entry).encode("utf-8"))
+
+    def clear(self) -> None:
+        from shutil import rmtree
+
+        with self._lock:
+            self._entries.clear()
+        if self.cache_dir:
+            rmtree(self.cache_dir, ignore_errors=True)
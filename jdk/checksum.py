@@ -0,0 +1,94 @@
+import hashlib
+import json
+import os
+from os import path as ospath
+from typing import IO
+from typing import Any
+from typing import Optional
+
+
+_ALGORITHM = "sha256"
+_DIGEST_SUFFIX = ".sha256.json"
+_CHUNK_SIZE = 1024 * 1024
+
+
+class HashingReader:
+    def __init__(self, fileobj: IO[bytes], algorithm: str = _ALGORITHM) -> None:
+        self._fileobj = fileobj
+        self._hash = hashlib.new(algorithm)
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._fileobj.read(size)
+        self._hash.update(data)
+        return data
+
+    def drain(self) -> None:
+        while self.read(_CHUNK_SIZE):
+            pass
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._fileobj, name)
+
+
+def new_hash(algorithm: str = _ALGORITHM) -> Any:
+    return hashlib.new(algorithm)
+
+
+def digest_file(file: str) -> str:
+    return f"{file}{_DIGEST_SUFFIX}"
+
+
+def file_digest(file: str, algorithm: str = _ALGORITHM) -> str:
+    digest = hashlib.new(algorithm)
+    with open(file, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def record_digest(file: str, digest: str, algorithm: str = _ALGORITHM) -> None:
+    st = os.stat(file)
+    record = {
+        "algorithm": algorithm,
+        "digest": digest.lower(),
+        "size": st.st_size,
+        "mtime": st.st_mtime,
+    }
+    with open(digest_file(file), "w") as f:
+        json.dump(record, f)
+
+
+def read_digest(file: str, algorithm: str = _ALGORITHM) -> Optional[str]:
+    try:
+        with open(digest_file(file)) as f:
+            record = json.load(f)
+        st = os.stat(file)
+    except (OSError, ValueError):
+        return None
+
+    # A recorded digest is only trusted while the file is unchanged
+    unchanged = record.get("size") == st.st_size and record.get("mtime") == st.st_mtime
+    if record.get("algorithm") == algorithm and unchanged:
+        return record.get("digest")
+    return None
+
+
+def get_digest(file: str, algorithm: str = _ALGORITHM) -> str:
+    digest = read_digest(file, algorithm)
+    if digest is None:
+        digest = file_digest(file, algorithm)
+        record_digest(file, digest, algorithm)
+    return digest
+
+
+def matches(digest: str, expected: str) -> bool:
+    return digest.lower() == expected.strip().lower()
+
+
+def discard(file: str) -> None:
+    for f in (file, digest_file(file)):
+        if ospath.exists(f):
+            os.remove(f)
@@ -1,6 +1,24 @@
-from jdk.client.adoptium import AdoptiumClient
+from importlib import import_module
+from typing import Any
 
-# Must be kept at the bottom of the init file to ensure proper vendor loading
 from jdk.client.client import load_client
-from jdk.client.corretto import CorrettoClient
-from jdk.client.zulu import ZuluClient
+
+
+# Vendor clients and the asyncio API are imported on first use to keep `import jdk` fast
+_lazy_attributes = {
+    "AdoptiumClient": "jdk.client.adoptium",
+    "AsyncClient": "jdk.client.aio",
+    "CorrettoClient": "jdk.client.corretto",
+    "ZuluClient": "jdk.client.zulu",
+    "load_async_client": "jdk.client.aio",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _lazy_attributes:
+        return getattr(import_module(_lazy_attributes[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> Any:
+    return sorted([*globals(), *_lazy_attributes])
@@ -1,4 +1,11 @@
+import json
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import List
 from typing import Optional
+from typing import Tuple
+from urllib.parse import urlencode
 
 from jdk.enums import Architecture
 from jdk.enums import BaseDetectableEnum
@@ -11,7 +18,15 @@ from jdk.enums import Vendor
 from jdk.extension import extends
 
 from .client import Client
+from .client import ClientError
+from .client import Resolution
+from .client import ResolutionSpec
+from .client import resolution_args
 from .client import vendor_client
+from .pool import urlopen
+
+
+_FEATURE_RELEASES_PAGE_SIZE = 20
 
 
 @extends(Architecture)
@@ -20,10 +35,6 @@ class AdoptiumArchitecture(BaseDetectableEnum):
     def detect(cls) -> Optional["AdoptiumArchitecture"]:
         return Architecture.detect()
 
-    @classmethod
-    def transform(cls, other: Architecture) -> Optional["AdoptiumArchitecture"]:
-        return AdoptiumArchitecture(other.value)
-
     X32 = "x32"
     PPC64LE = "ppc64le"
     S390X = "s390x"
@@ -77,17 +88,196 @@ class AdoptiumEnvironment(BaseEnum):
     STAGE = "https://staging-api.adoptium.net"
 
 
+def _find_package(
+    releases: List[Dict[str, Any]], operating_system: str, arch: str
+) -> Optional[Dict[str, Any]]:
+    # Releases are listed newest first, matching what the latest endpoint serves
+    for release in releases:
+        for binary in release.get("binaries", []):
+            if (
+                binary.get("os") == operating_system
+                and binary.get("architecture") == arch
+            ):
+                return binary.get("package")
+    return None
+
+
 @vendor_client(AdoptiumVendor)
 class AdoptiumClient(Client):
+    # Download URLs are built from the arguments alone, so they never go stale
+    resolution_ttl = 7 * 24 * 60 * 60
+
     def __init__(
         self, environment: Environment = AdoptiumEnvironment.PRODUCTION
     ) -> None:
         if environment == Environment.DEFAULT:
             base_url = AdoptiumEnvironment.PRODUCTION.value
         else:
-            base_url = environment.value
+            base_url = str(environment)
         super().__init__(base_url)
 
+    def binary_params(self, download_url: str) -> Optional[Dict[str, str]]:
+        prefix = f"{self._base_url}/v3/binary/latest/"
+        if not download_url.startswith(prefix):
+            return None
+
+        url_path, _, query = download_url[len(prefix) :].partition("?")
+        parts = url_path.split("/")
+        # The assets endpoints only list GA builds without static libs
+        if len(parts) != 8 or parts[1] != str(ReleaseType.GA) or query:
+            return None
+
+        version, _, operating_system, arch, image_type, impl, heap_size, vendor = parts
+        return {
+            "version": version,
+            "jvm_impl": impl,
+            "architecture": arch,
+            "heap_size": heap_size,
+            "image_type": image_type,
+            "os": operating_system,
+            "vendor": vendor,
+        }
+
+    def assets_query(self, download_url: str) -> Optional[Tuple[str, Dict[str, str]]]:
+        params = self.binary_params(download_url)
+        if params is None:
+            return None
+
+        version = params.pop("version")
+        impl = params.pop("jvm_impl")
+        return f"/v3/assets/latest/{version}/{impl}", params
+
+    @staticmethod
+    def match_asset(asset: Dict[str, Any], params: Dict[str, str]) -> bool:
+        if asset.get("vendor", params["vendor"]) != params["vendor"]:
+            return False
+
+        binary = asset.get("binary", {})
+        # A static mirror ignores the query and serves every build of a release
+        return all(
+            binary.get(name, params[name]) == params[name]
+            for name in ("architecture", "heap_size", "image_type", "os")
+        )
+
+    def load_assets(
+        self, download_url: str
+    ) -> Optional[Tuple[str, Dict[str, str], List[Dict[str, Any]]]]:
+        query = self.assets_query(download_url)
+        if query is None:
+            return None
+
+        assets_path, params = query
+        qry_params = {k: v for k, v in params.items() if k != "heap_size"}
+        qry_url = f"{self._base_url}{assets_path}?{urlencode(qry_params)}"
+
+        try:
+            assets = json.loads(urlopen(qry_url).read().decode("utf-8"))
+        except Exception as e:
+            raise ClientError(e) from e
+        return assets_path, params, assets
+
+    def load_feature_releases(
+        self, version: str, params: Dict[str, str]
+    ) -> List[Dict[str, Any]]:
+        qry_params = {
+            **params,
+            "page_size": _FEATURE_RELEASES_PAGE_SIZE,
+            "sort_order": "DESC",
+        }
+        qry_url = f"{self._base_url}/v3/assets/feature_releases/{version}/{ReleaseType.GA}?{urlencode(qry_params)}"  # noqa: B950
+
+        try:
+            return json.loads(urlopen(qry_url).read().decode("utf-8"))
+        except Exception as e:
+            raise ClientError(e) from e
+
+    def _group_by_release(
+        self, specs: List[ResolutionSpec], results: List[Optional[Resolution]]
+    ) -> Tuple[Dict[Tuple[Any, ...], Any], Dict[int, Any]]:
+        releases = {}
+        platforms = {}
+        for index, spec in enumerate(specs):
+            try:
+                download_url = self.get_download_url(**resolution_args(spec))
+            except Exception as e:
+                results[index] = Resolution(spec, None, None, None, e)
+                continue
+
+            params = self.binary_params(download_url)
+            if params is None or not params["version"].isdigit():
+                continue
+
+            # One listing per feature release covers every platform in the matrix
+            version = params.pop("version")
+            platform = (params.pop("os"), params.pop("architecture"))
+            key = (version, *sorted(params.items()))
+            releases[key] = (version, params)
+            platforms[index] = (key, platform)
+        return releases, platforms
+
+    @staticmethod
+    def _match_packages(
+        specs: List[ResolutionSpec],
+        results: List[Optional[Resolution]],
+        platforms: Dict[int, Any],
+        listings: Dict[Tuple[Any, ...], Any],
+    ) -> None:
+        for index, (key, platform) in platforms.items():
+            try:
+                package = _find_package(listings[key].result(), *platform)
+            except ClientError as e:
+                results[index] = Resolution(specs[index], None, None, None, e)
+                continue
+
+            if package is not None:
+                results[index] = Resolution(
+                    specs[index],
+                    package.get("link"),
+                    package.get("checksum"),
+                    package.get("size"),
+                    None,
+                )
+
+    def resolve_many(
+        self, specs: Iterable[ResolutionSpec], max_workers: Optional[int] = None
+    ) -> List[Resolution]:
+        specs = list(specs)
+        # A static mirror only serves the per-release asset lists
+        if self.mirror:
+            return super().resolve_many(specs, max_workers)
+
+        results = [None] * len(specs)
+        releases, platforms = self._group_by_release(specs, results)
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            listings = {
+                key: executor.submit(self.load_feature_releases, *query)
+                for key, query in releases.items()
+            }
+            self._match_packages(specs, results, platforms, listings)
+
+            # Builds missing from the recent releases go through the latest endpoint
+            unresolved = [i for i, result in enumerate(results) if result is None]
+            for index, result in zip(
+                unresolved, executor.map(self.resolve, [specs[i] for i in unresolved])
+            ):
+                results[index] = result
+
+        return results
+
+    def get_checksum(self, download_url: str) -> Optional[str]:
+        loaded = self.load_assets(download_url)
+        if loaded is None:
+            return None
+
+        _, params, assets = loaded
+        for asset in assets:
+            if self.match_asset(asset, params):
+                return asset.get("binary", {}).get("package", {}).get("checksum")
+        return None
+
     def get_download_url(
         self,
         version: str,
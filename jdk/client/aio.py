@@ -0,0 +1,158 @@
+import asyncio
+from concurrent.futures import Executor
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from threading import Lock
+from typing import Any
+from typing import Callable
+from typing import Optional
+from typing import TypeVar
+from typing import Union
+
+from jdk.cache import ArchiveCache
+from jdk.enums import Architecture
+from jdk.enums import JvmImpl
+from jdk.enums import OperatingSystem
+from jdk.enums import Vendor
+from jdk.events import ProgressCallback
+
+from .client import Client
+from .client import ClientError
+from .client import load_client
+
+
+_MAX_WORKERS = 64
+
+_executor = None
+_executor_lock = Lock()
+
+T = TypeVar("T")
+
+
+def _default_executor() -> Executor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=_MAX_WORKERS, thread_name_prefix="jdk-aio"
+            )
+        return _executor
+
+
+class AsyncClient:
+    def __init__(
+        self,
+        client: Client,
+        executor: Optional[Executor] = None,
+        vendor: Optional[Union[Vendor, str]] = None,
+    ) -> None:
+        self._client = client
+        self._executor = executor
+        # Installs are registered under the vendor the client was loaded for
+        self._vendor = vendor or type(client)
+
+    @property
+    def client(self) -> Client:
+        return self._client
+
+    async def _run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        loop = asyncio.get_running_loop()
+        executor = self._executor or _default_executor()
+        return await loop.run_in_executor(executor, partial(func, *args, **kwargs))
+
+    async def get_download_url(
+        self,
+        version: str,
+        operating_system: Optional[OperatingSystem] = None,
+        arch: Optional[Architecture] = None,
+        impl: JvmImpl = JvmImpl.HOTSPOT,
+        jre: bool = False,
+        **kwargs: Any,
+    ) -> str:
+        # Delegate to the vendor client so URL resolution matches the sync API
+        return await self._run(
+            self._client.get_download_url,
+            version,
+            operating_system,
+            arch,
+            impl,
+            jre,
+            **kwargs,
+        )
+
+    async def download(
+        self,
+        download_url: str,
+        *,
+        cache: Optional[ArchiveCache] = None,
+        connections: int = 1,
+        retries: int = 0,
+        backoff_factor: float = 1.0,
+        verify: bool = True,
+        progress: Optional[ProgressCallback] = None,
+    ) -> Optional[str]:
+        checksum = None
+        if verify:
+            checksum = await self._run(self._client.get_checksum, download_url)
+
+        # The synchronous download handles caching, resume and checksums
+        return await self._run(
+            self._client.download,
+            download_url,
+            cache=cache,
+            checksum=checksum,
+            connections=connections,
+            retries=retries,
+            backoff_factor=backoff_factor,
+            progress=progress,
+        )
+
+    async def install(
+        self,
+        version: str,
+        operating_system: Optional[OperatingSystem] = None,
+        arch: Optional[Architecture] = None,
+        impl: JvmImpl = JvmImpl.HOTSPOT,
+        jre: bool = False,
+        path: Optional[str] = None,
+        *,
+        force: bool = False,
+        **options: Any,
+    ) -> str:
+        import jdk
+
+        jdk._check_options("install", options)
+        operating_system = operating_system or jdk.OS
+        arch = arch or jdk.ARCH
+        if not path:
+            path = jdk._JRE_DIR if jre else jdk._JDK_DIR
+
+        spec = (version, self._vendor, operating_system, arch, impl, jre)
+        if not force and not jdk._is_filtered(options):
+            # A registered build is returned without any vendor requests, as in install
+            installed = await self._run(jdk.find_installed, *spec, path)
+            if installed:
+                return installed.path
+
+        url = await self.get_download_url(version, operating_system, arch, impl, jre)
+        return await self._run(
+            jdk._install_registered, self._client, url, path, spec, force, **options
+        )
+
+
+async def load_async_client(
+    vendor: Optional[Union[Vendor, str]] = "Adoptium",
+    *args: Any,
+    executor: Optional[Executor] = None,
+    **kwargs: Any,
+) -> AsyncClient:
+    client_class = load_client(vendor)
+    if client_class is None:
+        raise ClientError(f"Unknown vendor {vendor}")
+
+    # Some vendor clients load metadata on construction, so keep that off the loop
+    loop = asyncio.get_running_loop()
+    client = await loop.run_in_executor(
+        executor or _default_executor(), partial(client_class, *args, **kwargs)
+    )
+    return AsyncClient(client, executor, vendor)
@@ -1,29 +1,97 @@
-import shutil
-import tempfile
+import json
+import os
+import time
+from collections import namedtuple
 from collections.abc import Iterable
+from functools import partial
+from functools import wraps
+from hashlib import sha256
+from importlib import import_module
 from os import path
+from typing import IO
+from typing import TYPE_CHECKING
+from typing import Any
 from typing import Callable
+from typing import Dict
 from typing import List
+from typing import Mapping
 from typing import Optional
+from typing import Tuple
+from typing import TypeVar
 from typing import Union
-from urllib import request
 from urllib.parse import urlsplit
 
+from jdk.cache import DEFAULT_RESOLUTION_TTL
+from jdk.cache import ArchiveCache
+from jdk.cache import ResolutionCache
+from jdk.checksum import discard
+from jdk.checksum import file_digest
+from jdk.checksum import get_digest
+from jdk.checksum import matches
+from jdk.checksum import new_hash
+from jdk.checksum import record_digest
 from jdk.enums import Architecture
 from jdk.enums import Implementation
 from jdk.enums import JvmImpl
 from jdk.enums import OperatingSystem
 from jdk.enums import Vendor
+from jdk.events import ProgressCallback
+from jdk.events import progress_counter
+from jdk.extractor import has_compressed_file_ext
+from jdk.filelock import FileLock
+
+
+if TYPE_CHECKING:
+    from .pool import Response
 
 
 _vendor_clients = dict()
 
+# Vendor modules are only imported once one of their names is asked for
+_vendor_modules = {
+    "adoptium": "jdk.client.adoptium",
+    "temurin": "jdk.client.adoptium",
+    "adoptopenjdk": "jdk.client.adoptium",
+    "eclipse": "jdk.client.adoptium",
+    "corretto": "jdk.client.corretto",
+    "amazon": "jdk.client.corretto",
+    "aws": "jdk.client.corretto",
+    "zulu": "jdk.client.zulu",
+    "azul": "jdk.client.zulu",
+}
+
+_MIRROR_ENV = "INSTALL_JDK_MIRROR"
+_RESOLUTION_ARGS = ("version", "operating_system", "arch", "impl", "jre")
+_resolution_cache = ResolutionCache()
+
+_CHUNK_SIZE = 1024 * 1024
+_MIN_RANGE_SIZE = 4 * 1024 * 1024
+_CHECKPOINT_SIZE = 8 * 1024 * 1024
+
+T = TypeVar("T")
+
+Resolution = namedtuple("Resolution", "spec url checksum size error")
+ResolutionSpec = Union[str, Mapping[str, Any]]
+
 
 class ClientError(Exception):
     pass
 
 
+class ChecksumError(ClientError):
+    def __init__(self, download_url: str, expected: str, actual: str) -> None:
+        super().__init__(
+            f"Checksum mismatch for {download_url}: expected {expected}, got {actual}"
+        )
+        self.download_url = download_url
+        self.expected = expected
+        self.actual = actual
+
+
 class Client:
+    resolution_ttl = DEFAULT_RESOLUTION_TTL
+    mirror = False
+
     @staticmethod
     def normalize_version(version: str) -> str:
         if version == "1.8":
@@ -43,34 +111,484 @@ class Client:
     ) -> str:
         raise NotImplementedError("get_download_url")
 
-    def download(self, download_url: str) -> Optional[str]:
+    def get_checksum(self, download_url: str) -> Optional[str]:
+        return None
+
+    def resolve(self, spec: ResolutionSpec) -> Resolution:
+        try:
+            download_url = self.get_download_url(**resolution_args(spec))
+            checksum = self.get_checksum(download_url)
+            return Resolution(spec, download_url, checksum, None, None)
+        except Exception as e:
+            return Resolution(spec, None, None, None, e)
+
+    def resolve_many(
+        self, specs: Iterable[ResolutionSpec], max_workers: Optional[int] = None
+    ) -> List[Resolution]:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self.resolve, specs))
+
+    def _resolution(self, download_url: str) -> Dict[str, Any]:
+        return {"url": download_url}
+
+    def _restore_resolution(self, resolution: Dict[str, Any]) -> None:
+        pass
+
+    def open(
+        self,
+        download_url: str,
+        *,
+        method: str = "GET",
+        headers: Optional[Dict[str, str]] = None,
+    ) -> "Response":
+        from urllib.request import Request
+
+        from .pool import urlopen
+
         if download_url.lower().startswith("http"):
-            req = request.Request(download_url, headers={"User-Agent": "Mozilla/5.0"})
+            req_headers = {"User-Agent": "Mozilla/5.0"}
+            if headers:
+                req_headers.update(headers)
+            req = Request(download_url, headers=req_headers, method=method)
         else:
             raise ClientError("Invalid Download URL")
 
+        return urlopen(req)
+
+    @staticmethod
+    def get_file_name(response: "Response", download_url: str) -> Optional[str]:
+        headers = response.headers
+        content_disposition = headers.get_content_disposition()
+        if content_disposition:
+            return headers.get_filename()
+        else:
+            url_path = urlsplit(download_url).path
+            file_name = path.basename(url_path)
+            if file_name and not has_compressed_file_ext(file_name):
+                # Name extensionless archives after their whole path so they stay unique
+                return url_path.strip("/").replace("/", "-")
+            return file_name
+
+    def download(
+        self,
+        download_url: str,
+        *,
+        cache: Optional[ArchiveCache] = None,
+        checksum: Optional[str] = None,
+        connections: int = 1,
+        retries: int = 0,
+        backoff_factor: float = 1.0,
+        progress: Optional[ProgressCallback] = None,
+    ) -> Optional[str]:
+        if cache is not None:
+            cached_file = cache.get(download_url, checksum)
+            if cached_file:
+                if checksum:
+                    _verify(cached_file, checksum, download_url)
+                if progress is not None:
+                    size = path.getsize(cached_file)
+                    progress(size, size)
+                return cached_file
+
         jdk_file = None
-        with request.urlopen(req) as open_request:  # noqa: S310
-            headers = open_request.headers
-            content_disposition = headers.get_content_disposition()
-            if content_disposition:
-                jdk_file = headers.get_filename()
-            else:
-                url_path = urlsplit(download_url).path
-                jdk_file = path.basename(url_path)
+        if connections > 1:
+            jdk_file = self._download_ranges(
+                download_url, connections, retries, backoff_factor, progress
+            )
+
+        if jdk_file is None:
+            jdk_file = _retry(
+                lambda: self._download_stream(download_url, checksum, progress),
+                retries,
+                backoff_factor,
+            )
+
+        if jdk_file and checksum:
+            _verify(jdk_file, checksum, download_url)
 
+        if cache is not None and jdk_file:
+            jdk_file = cache.put(download_url, jdk_file, checksum)
+        return jdk_file
+
+    def _download_stream(
+        self,
+        download_url: str,
+        checksum: Optional[str] = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> Optional[str]:
+        from tempfile import gettempdir
+
+        url_hash = sha256(download_url.encode("utf-8")).hexdigest()
+        part_file = path.join(gettempdir(), f"{url_hash}.part")
+        # Downloads of one URL take turns on its part file and checkpoint
+        with FileLock(f"{part_file}.lock", delete=True):
+            return self._download_part(download_url, part_file, checksum, progress)
+
+    def _download_part(
+        self,
+        download_url: str,
+        part_file: str,
+        checksum: Optional[str] = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> Optional[str]:
+        from urllib.error import HTTPError
+
+        state_file = f"{part_file}.json"
+        offset, headers = _resume_offset(download_url, part_file, state_file)
+        if headers is None:
+            # The last attempt stopped after the whole archive had arrived
+            jdk_file = _finish_part(part_file, state_file, checksum)
             if jdk_file:
-                jdk_file = path.join(tempfile.gettempdir(), jdk_file)
-                with open(jdk_file, "wb") as out_file:
-                    shutil.copyfileobj(open_request, out_file)
+                return jdk_file
+            offset, headers = 0, {}
+
+        try:
+            response = self.open(download_url, headers=headers)
+        except HTTPError as e:
+            if e.code != 416 or not headers:
+                raise
+            # The range starts at or past the end, so the part may already be whole
+            jdk_file = _finish_part(part_file, state_file, checksum)
+            if jdk_file:
+                return jdk_file
+            response = self.open(download_url)
+
+        with response:
+            if response.status != 206:
+                # The server ignored the range or the resource changed upstream
+                offset = 0
+
+            file_name = self.get_file_name(response, download_url)
+            if not file_name:
+                return None
+
+            content_length = response.headers.get("Content-Length")
+            expected_size = offset + int(content_length) if content_length else None
+            state = {
+                "url": download_url,
+                "file_name": file_name,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "offset": offset,
+                "size": expected_size,
+            }
+            _write_state(state_file, state)
+            offset, digest = _write_part(
+                response, part_file, state_file, state, expected_size, progress
+            )
+
+        if expected_size is not None and offset != expected_size:
+            from http.client import IncompleteRead
+
+            raise IncompleteRead(b"", expected_size - offset)
+
+        jdk_file = temporary_file(file_name)
+        os.replace(part_file, jdk_file)
+        os.remove(state_file)
+        record_digest(jdk_file, digest)
         return jdk_file
 
+    def _download_ranges(
+        self,
+        download_url: str,
+        connections: int,
+        retries: int = 0,
+        backoff_factor: float = 1.0,
+        progress: Optional[ProgressCallback] = None,
+    ) -> Optional[str]:
+        with self.open(download_url, method="HEAD") as response:
+            resolved_url = response.geturl()
+            accept_ranges = response.headers.get("Accept-Ranges", "")
+            content_length = int(response.headers.get("Content-Length") or 0)
+            jdk_file = self.get_file_name(response, download_url)
+
+        # Fall back to a single stream when the server can not serve byte ranges
+        supports_ranges = "bytes" in accept_ranges.lower()
+        if not supports_ranges or not content_length or not jdk_file:
+            return None
+
+        ranges = _split_ranges(content_length, connections)
+        if len(ranges) < 2:
+            return None
+
+        jdk_file = temporary_file(jdk_file)
+        with open(jdk_file, "wb") as out_file:
+            out_file.truncate(content_length)
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        advance = progress_counter(progress, content_length)
+        try:
+            with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+                futures = [
+                    executor.submit(
+                        _retry,
+                        partial(
+                            self._download_range, resolved_url, jdk_file, *r, advance
+                        ),
+                        retries,
+                        backoff_factor,
+                    )
+                    for r in ranges
+                ]
+                for future in futures:
+                    future.result()
+
+            if path.getsize(jdk_file) != content_length:
+                raise ClientError(f"Incomplete download of {download_url}")
+        except Exception:
+            os.remove(jdk_file)
+            raise
+
+        # Ranges arrive out of order, so the digest needs one pass over the result
+        record_digest(jdk_file, file_digest(jdk_file))
+        return jdk_file
+
+    def _download_range(
+        self,
+        download_url: str,
+        file: str,
+        start: int,
+        end: int,
+        advance: Callable[[int], None],
+    ) -> None:
+        headers = {"Range": f"bytes={start}-{end}"}
+        with self.open(download_url, headers=headers) as response:
+            content_range = response.headers.get("Content-Range", "")
+            partial = content_range.startswith(f"bytes {start}-")
+            if response.status != 206 or not partial:
+                raise ClientError(f"Unexpected range response from {download_url}")
+
+            remaining = end - start + 1
+            with open(file, "r+b") as out_file:
+                out_file.seek(start)
+                while remaining > 0:
+                    chunk = response.read(min(_CHUNK_SIZE, remaining))
+                    if not chunk:
+                        break
+                    out_file.write(chunk)
+                    remaining -= len(chunk)
+                    advance(len(chunk))
+
+        if remaining:
+            raise ClientError(f"Incomplete range {start}-{end} from {download_url}")
+
+
+def resolution_args(spec: ResolutionSpec) -> Dict[str, Any]:
+    if isinstance(spec, str):
+        return {"version": spec}
+    return dict(spec)
+
+
+def _verify(file: str, checksum: str, download_url: str) -> None:
+    digest = get_digest(file)
+    if not matches(digest, checksum):
+        discard(file)
+        raise ChecksumError(download_url, checksum, digest)
+
+
+def _is_retryable(error: Exception) -> bool:
+    from http.client import HTTPException
+    from urllib.error import HTTPError
+    from urllib.error import URLError
+
+    if isinstance(error, HTTPError):
+        return error.code >= 500 or error.code == 429
+    return isinstance(error, (URLError, OSError, HTTPException))
+
+
+def _retry(call: Callable[[], T], retries: int, backoff_factor: float) -> T:
+    attempt = 0
+    while True:
+        try:
+            return call()
+        except Exception as e:
+            if attempt >= retries or not _is_retryable(e):
+                raise
+            time.sleep(backoff_factor * (2**attempt))
+            attempt += 1
+
+
+def _read_state(state_file: str) -> Dict[str, Any]:
+    try:
+        with open(state_file) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _resume_offset(
+    download_url: str, part_file: str, state_file: str
+) -> Tuple[int, Optional[Dict[str, str]]]:
+    state = _read_state(state_file)
+    if state.get("url") != download_url or not path.isfile(part_file):
+        return 0, {}
+
+    offset = min(state.get("offset", 0), path.getsize(part_file))
+    size = state.get("size")
+    if size is not None and offset >= size:
+        return offset, None
+
+    validator = state.get("etag") or state.get("last_modified")
+    if not offset or not validator:
+        return 0, {}
+    return offset, {"Range": f"bytes={offset}-", "If-Range": validator}
+
+
+def _finish_part(
+    part_file: str, state_file: str, checksum: Optional[str]
+) -> Optional[str]:
+    file_name = _read_state(state_file).get("file_name")
+    if checksum and file_name:
+        digest = file_digest(part_file)
+        if matches(digest, checksum):
+            jdk_file = temporary_file(file_name)
+            os.replace(part_file, jdk_file)
+            os.remove(state_file)
+            record_digest(jdk_file, digest)
+            return jdk_file
+
+    # A part that can not be verified is thrown away and downloaded again
+    for file in (part_file, state_file):
+        if path.exists(file):
+            os.remove(file)
+    return None
+
+
+def _hash_prefix(file: IO[bytes], digest: Any, size: int) -> None:
+    while size > 0:
+        chunk = file.read(min(_CHUNK_SIZE, size))
+        if not chunk:
+            break
+        digest.update(chunk)
+        size -= len(chunk)
+
+
+def _write_part(
+    response: "Response",
+    part_file: str,
+    state_file: str,
+    state: Dict[str, Any],
+    expected_size: Optional[int],
+    progress: Optional[ProgressCallback],
+) -> Tuple[int, str]:
+    offset = checkpoint = state["offset"]
+    digest = new_hash()
+    with open(part_file, "r+b" if offset else "wb") as out_file:
+        # Only the resumed prefix is re-read, the rest is hashed as it arrives
+        _hash_prefix(out_file, digest, offset)
+        out_file.seek(offset)
+        out_file.truncate()
+        while True:
+            chunk = response.read(_CHUNK_SIZE)
+            if not chunk:
+                break
+            out_file.write(chunk)
+            digest.update(chunk)
+            offset += len(chunk)
+            if progress is not None:
+                progress(offset, expected_size)
+            if offset - checkpoint >= _CHECKPOINT_SIZE:
+                out_file.flush()
+                state["offset"] = checkpoint = offset
+                _write_state(state_file, state)
+
+        out_file.flush()
+        state["offset"] = offset
+        _write_state(state_file, state)
+    return offset, digest.hexdigest()
+
+
+def temporary_file(file_name: str) -> str:
+    from tempfile import mkstemp
+
+    # Every download gets its own file, so downloads of one URL never share a target
+    fd, file = mkstemp(suffix=f"-{file_name}")
+    os.close(fd)
+    return file
+
+
+def _write_state(state_file: str, state: Dict[str, Any]) -> None:
+    tmp_file = f"{state_file}.tmp"
+    with open(tmp_file, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp_file, state_file)
+
+
+def _split_ranges(content_length: int, connections: int) -> List[Tuple[int, int]]:
+    connections = max(1, min(connections, content_length // _MIN_RANGE_SIZE))
+    range_size = -(-content_length // connections)
+    return [
+        (start, min(start + range_size, content_length) - 1)
+        for start in range(0, content_length, range_size)
+    ]
+
+
+def get_resolution_cache() -> Optional[ResolutionCache]:
+    return _resolution_cache
+
+
+def set_resolution_cache(cache: Optional[ResolutionCache]) -> None:
+    global _resolution_cache
+    _resolution_cache = cache
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, (list, tuple, set)):
+        return [_normalize(v) for v in value]
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    return str(value)
+
+
+def _resolution_key(
+    client: Client, args: Tuple[Any, ...], kwargs: Dict[str, Any]
+) -> str:
+    params = dict(zip(_RESOLUTION_ARGS, args))
+    params.update(kwargs)
+    params["version"] = Client.normalize_version(str(params["version"]))
+    params.setdefault("impl", JvmImpl.HOTSPOT)
+    params.setdefault("jre", False)
+    normalized = {name: _normalize(value) for name, value in params.items()}
+    return json.dumps(
+        [type(client).__name__, client._base_url, normalized], sort_keys=True
+    )
+
+
+def _memoize_resolution(get_download_url: Callable[..., str]) -> Callable[..., str]:
+    @wraps(get_download_url)
+    def wrapper(self: Client, *args: Any, **kwargs: Any) -> str:
+        cache = _resolution_cache
+        has_version = bool(args) or "version" in kwargs
+        if cache is None or not has_version or len(args) > len(_RESOLUTION_ARGS):
+            return get_download_url(self, *args, **kwargs)
+
+        key = _resolution_key(self, args, kwargs)
+        resolution = cache.get(key)
+        if resolution is not None:
+            self._restore_resolution(resolution)
+            return resolution["url"]
+
+        download_url = get_download_url(self, *args, **kwargs)
+        if download_url:
+            cache.put(key, self._resolution(download_url), self.resolution_ttl)
+        return download_url
+
+    wrapper._memoized = True
+    return wrapper
+
 
 def vendor_client(
     vendor: Union[Vendor, str, List[Vendor], List[str]]
 ) -> Callable[[Client], Client]:
     def wrapper(client: Client) -> Client:
-        if isinstance(vendor, Iterable):
+        get_download_url = client.__dict__.get("get_download_url")
+        if get_download_url and not getattr(get_download_url, "_memoized", False):
+            client.get_download_url = _memoize_resolution(get_download_url)
+
+        if isinstance(vendor, Iterable) and not isinstance(vendor, str):
             unique_vendors = vendor
             for unique_vendor in unique_vendors:
                 vendor_name = str(unique_vendor).lower()
@@ -88,5 +606,22 @@ def load_client(vendor: Optional[Union[Vendor, str]] = "Adoptium") -> Optional[C
         vendor = "Adoptium"
 
     vendor_name = str(vendor).lower()
-    if vendor_name in _vendor_clients:
-        return _vendor_clients[vendor_name]
+    if vendor_name not in _vendor_clients and vendor_name in _vendor_modules:
+        import_module(_vendor_modules[vendor_name])
+
+    return _vendor_clients.get(vendor_name)
+
+
+def create_client(
+    vendor: Optional[Union[Vendor, str]], mirror: Optional[str] = None
+) -> Client:
+    mirror = mirror or os.environ.get(_MIRROR_ENV)
+    if mirror:
+        from jdk.mirror import mirror_client
+
+        return mirror_client(vendor, mirror)
+
+    client_class = load_client(vendor)
+    if client_class is None:
+        raise ClientError(f"Unknown vendor {vendor}")
+    return client_class()
@@ -1,8 +1,17 @@
 import json
+import time
+from hashlib import sha256
+from sys import intern
+from threading import Lock
 from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
 from typing import Optional
-from urllib.request import urlopen
+from typing import Tuple
 
+from jdk.cache import MetadataCache
 from jdk.enums import Architecture
 from jdk.enums import BaseDetectableEnum
 from jdk.enums import BaseEnum
@@ -15,9 +24,15 @@ from jdk.extension import extends
 
 from .client import Client
 from .client import ClientError
+from .client import Resolution
+from .client import ResolutionSpec
 from .client import vendor_client
 
 
+_MIRROR_INDEX_MAP_PATH = "latest_links/indexmap_with_checksum.json"
+
+IndexKey = Tuple[str, str, str, str, str]
+
 _INDEX_MAP_URL = "https://raw.githubusercontent.com/corretto/corretto-downloads/main/latest_links/indexmap_with_checksum.json"  # noqa: B950
 
 
@@ -33,24 +48,16 @@ class CorrettoImageType(BaseEnum):
     HEADLESS = "headless"
 
 
-@extends(OperatingSystem)
+@extends(
+    OperatingSystem,
+    translate={OperatingSystem.MAC: "macos", OperatingSystem.ALPINE_LINUX: "alpine"},
+)
 class CorrettoOperatingSystem(BaseDetectableEnum):
     @classmethod
     def detect(cls) -> "CorrettoOperatingSystem":
         detected_os = OperatingSystem.detect()
         return cls.transform(detected_os)
 
-    @classmethod
-    def transform(
-        cls, operating_system: OperatingSystem
-    ) -> Optional["CorrettoOperatingSystem"]:
-        if operating_system == OperatingSystem.MAC:
-            return CorrettoOperatingSystem.MACOS
-        elif operating_system == OperatingSystem.ALPINE_LINUX:
-            return CorrettoOperatingSystem.ALPINE
-        else:
-            return CorrettoOperatingSystem(operating_system.value)
-
     AL2 = "al2"
     AL2022 = "al2022"
     ALPINE = "alpine"
@@ -63,9 +70,50 @@ class CorrettoEnvironment(BaseEnum):
     PRODUCTION = "https://corretto.aws"
 
 
+class CorrettoIndexEntry:
+    __slots__ = ("resource", "checksum")
+
+    def __init__(self, resource: str, checksum: Optional[str]) -> None:
+        self.resource = resource
+        self.checksum = checksum
+
+
+class CorrettoIndex:
+    # The nested index map is flattened once and dropped, keeping only the leaves
+    __slots__ = ("digest", "loaded", "_entries", "_checksums")
+
+    def __init__(self, body: bytes, digest: str) -> None:
+        self.digest = digest
+        self.loaded = time.monotonic()
+        self._entries: Dict[IndexKey, CorrettoIndexEntry] = {}
+        self._checksums: Dict[str, Optional[str]] = {}
+        for key, leaf in _index_leaves(json.loads(body.decode("utf-8"))):
+            entry = CorrettoIndexEntry(leaf["resource"], leaf.get("checksum_sha256"))
+            self._entries[tuple(intern(part) for part in key)] = entry
+            self._checksums[entry.resource] = entry.checksum
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(
+        self,
+        operating_system: str,
+        arch: str,
+        image_type: str,
+        version: str,
+        file_format: str,
+    ) -> Optional[CorrettoIndexEntry]:
+        return self._entries.get(
+            (operating_system, arch, image_type, version, file_format)
+        )
+
+    def checksum(self, resource: str) -> Optional[str]:
+        return self._checksums.get(resource)
+
+
 class CorrettoResourceBuilder:
-    def __init__(self, index_map: dict) -> None:
-        self._index_map = index_map
+    def __init__(self, index: CorrettoIndex) -> None:
+        self._index = index
         self._file_format = "tar.gz"
 
         self.operating_system: CorrettoOperatingSystem = OperatingSystem.LINUX
@@ -74,7 +122,14 @@ class CorrettoResourceBuilder:
         self.versrion = None
 
     def _get_resource(self) -> Optional[str]:
-        return self._index_map_position[self._file_format]["resource"]
+        entry = self._index.get(
+            self.operating_system.value,
+            self.architecure.value,
+            self.image_type.value,
+            self.versrion,
+            self._file_format,
+        )
+        return entry.resource if entry else None
 
     def set_operating_system(
         self, operating_system: CorrettoOperatingSystem
@@ -102,28 +157,85 @@ class CorrettoResourceBuilder:
         if version is not None:
             self.versrion = version
 
-        return self._index_map[self.operating_system.value][self.architecure.value][
-            self.image_type.value
-        ][self.versrion][self._file_format]["resource"]
+        resource = self._get_resource()
+        if resource is None:
+            raise ClientError(
+                f"No Corretto {self.image_type} {self.versrion} build for "
+                f"{self.operating_system} {self.architecure} ({self._file_format})"
+            )
+        return resource
+
+
+def _index_leaves(
+    index_map: Any, key: Tuple[str, ...] = ()
+) -> Iterator[Tuple[Tuple[str, ...], Dict[str, str]]]:
+    if isinstance(index_map, dict):
+        if "resource" in index_map:
+            yield key, index_map
+        else:
+            for name, value in index_map.items():
+                yield from _index_leaves(value, (*key, name))
 
 
 @vendor_client(CorrettoVendor)
 class CorrettoClient(Client):
-    _index_map = None
+    _indexes: Dict[str, CorrettoIndex] = {}
+    _index_lock = Lock()
+    _metadata_cache: Optional[MetadataCache] = None
+    # Resources point at Corretto's "latest" links, which follow new releases
+    resolution_ttl = 24 * 60 * 60
 
     @classmethod
-    def load_index_map(cls) -> Optional[Any]:
+    def metadata_cache(cls) -> MetadataCache:
+        # Created on first use, so importing the client never touches the home dir
+        if cls._metadata_cache is None:
+            cls._metadata_cache = MetadataCache()
+        return cls._metadata_cache
+
+    @classmethod
+    def load_index_map(cls, index_map_url: str = _INDEX_MAP_URL) -> Optional[Any]:
         try:
-            if cls._index_map is None:
-                cls._index_map = json.loads(
-                    urlopen(_INDEX_MAP_URL)  # noqa: S310 Known URL
-                    .read()
-                    .decode("utf-8")
-                )
+            return cls.metadata_cache().fetch_json(index_map_url)
         except Exception as e:
             raise ClientError(e) from e
-        else:
-            return cls._index_map
+
+    @classmethod
+    def _load_index(cls, index_map_url: str, ttl: Optional[float]) -> CorrettoIndex:
+        try:
+            body = cls.metadata_cache().fetch(index_map_url, ttl)
+        except Exception as e:
+            raise ClientError(e) from e
+
+        digest = sha256(body).hexdigest()
+        index = cls._indexes.get(index_map_url)
+        # An unchanged or revalidated index map is not parsed again
+        if index is None or index.digest != digest:
+            index = cls._indexes[index_map_url] = CorrettoIndex(body, digest)
+        index.loaded = time.monotonic()
+        return index
+
+    @classmethod
+    def _fresh_index(cls, index_map_url: str) -> Optional[CorrettoIndex]:
+        index = cls._indexes.get(index_map_url)
+        if index is None:
+            return None
+        age = time.monotonic() - index.loaded
+        return index if age < cls.metadata_cache().ttl else None
+
+    @classmethod
+    def load_index(cls, index_map_url: str = _INDEX_MAP_URL) -> CorrettoIndex:
+        index = cls._fresh_index(index_map_url)
+        if index is None:
+            with cls._index_lock:
+                index = cls._fresh_index(index_map_url)
+                if index is None:
+                    index = cls._load_index(index_map_url, None)
+        return index
+
+    @classmethod
+    def reload_index(cls, index_map_url: str = _INDEX_MAP_URL) -> CorrettoIndex:
+        with cls._index_lock:
+            return cls._load_index(index_map_url, 0)
 
     def __init__(
         self, environment: Environment = CorrettoEnvironment.PRODUCTION
@@ -131,10 +243,26 @@ class CorrettoClient(Client):
         if environment == Environment.DEFAULT:
             base_url = CorrettoEnvironment.PRODUCTION.value
         else:
-            base_url = environment.value
+            base_url = str(environment)
         super().__init__(base_url)
 
-        self._index_map = CorrettoClient.load_index_map()
+    @property
+    def index_map_url(self) -> str:
+        if self.mirror:
+            return f"{self._base_url}/{_MIRROR_INDEX_MAP_PATH}"
+        return _INDEX_MAP_URL
+
+    def get_checksum(self, download_url: str) -> Optional[str]:
+        if not download_url.startswith(self._base_url):
+            return None
+        resource = download_url[len(self._base_url) :]
+        return CorrettoClient.load_index(self.index_map_url).checksum(resource)
+
+    def resolve_many(
+        self, specs: Iterable[ResolutionSpec], max_workers: Optional[int] = None
+    ) -> List[Resolution]:
+        # Every build resolves from the one cached index map, so threads only add cost
+        return [self.resolve(spec) for spec in specs]
 
     def get_download_url(
         self,
@@ -146,7 +274,7 @@ class CorrettoClient(Client):
         *,
         image_type: CorrettoImageType = ImageType.JDK,
     ) -> str:
-        builder = CorrettoResourceBuilder(self._index_map)
+        builder = CorrettoResourceBuilder(CorrettoClient.load_index(self.index_map_url))
 
         version = Client.normalize_version(version)
         builder.set_version(version)
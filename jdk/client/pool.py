@@ -0,0 +1,276 @@
+from collections import namedtuple
+from functools import partial
+from http.client import HTTPConnection
+from http.client import HTTPException
+from http.client import HTTPResponse
+from http.client import HTTPSConnection
+from io import BytesIO
+from threading import Lock
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Union
+from urllib import request
+from urllib.error import HTTPError
+from urllib.error import URLError
+from urllib.parse import urljoin
+from urllib.parse import urlsplit
+
+
+_REDIRECT_CODES = (301, 302, 303, 307, 308)
+_MAX_REDIRECTS = 10
+_MAX_IDLE_PER_HOST = 8
+
+
+HostStats = namedtuple("HostStats", "host requests connections reused redirects errors")
+
+_HostKey = Tuple[str, str, Optional[int]]
+
+
+def _use_urllib(url: str) -> bool:
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    if scheme not in ("http", "https"):
+        return True
+    return scheme in request.getproxies() and not request.proxy_bypass(
+        parts.hostname or ""
+    )
+
+
+class PooledResponse:
+    def __init__(
+        self,
+        response: HTTPResponse,
+        url: str,
+        release: Callable[[bool], None],
+    ) -> None:
+        self._response = response
+        self._release = release
+        self._released = False
+        self.url = url
+
+    @property
+    def status(self) -> int:
+        return self._response.status
+
+    @property
+    def reason(self) -> str:
+        return self._response.reason
+
+    @property
+    def headers(self) -> Any:
+        return self._response.headers
+
+    def info(self) -> Any:
+        return self._response.headers
+
+    def geturl(self) -> str:
+        return self.url
+
+    def getcode(self) -> int:
+        return self._response.status
+
+    def _done(self, reusable: bool) -> None:
+        if not self._released:
+            self._released = True
+            self._release(reusable and not self._response.will_close)
+
+    def read(self, amt: Optional[int] = None) -> bytes:
+        data = self._response.read(amt)
+        if self._response.isclosed():
+            self._done(True)
+        return data
+
+    def readinto(self, b: Any) -> int:
+        n = self._response.readinto(b)
+        if self._response.isclosed():
+            self._done(True)
+        return n
+
+    def close(self) -> None:
+        # A partially read response leaves the connection in an unknown state
+        reusable = self._response.isclosed()
+        self._response.close()
+        self._done(reusable)
+
+    def __enter__(self) -> "PooledResponse":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+
+Response = Union[HTTPResponse, PooledResponse]
+
+
+class ConnectionPool:
+    def __init__(
+        self,
+        max_idle_per_host: int = _MAX_IDLE_PER_HOST,
+        timeout: Optional[float] = None,
+        max_redirects: int = _MAX_REDIRECTS,
+    ) -> None:
+        self.max_idle_per_host = max_idle_per_host
+        self.timeout = timeout
+        self.max_redirects = max_redirects
+        self._idle: Dict[_HostKey, List[HTTPConnection]] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._lock = Lock()
+
+    def _count(self, key: _HostKey, **counts: int) -> None:
+        _, host, port = key
+        if port is not None:
+            host = f"{host}:{port}"
+        with self._lock:
+            stats = self._stats.setdefault(
+                host, dict.fromkeys(HostStats._fields[1:], 0)
+            )
+            for name, count in counts.items():
+                stats[name] += count
+
+    def _acquire(self, key: _HostKey) -> Tuple[HTTPConnection, bool]:
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop(), True
+
+        scheme, host, port = key
+        if scheme == "https":
+            return HTTPSConnection(host, port, timeout=self.timeout), False
+        return HTTPConnection(host, port, timeout=self.timeout), False
+
+    def _release(self, key: _HostKey, conn: HTTPConnection, reusable: bool) -> None:
+        if reusable:
+            with self._lock:
+                idle = self._idle.setdefault(key, [])
+                if len(idle) < self.max_idle_per_host:
+                    idle.append(conn)
+                    return
+        conn.close()
+
+    def _send(
+        self,
+        key: _HostKey,
+        method: str,
+        target: str,
+        body: Optional[bytes],
+        headers: Dict[str, str],
+    ) -> Tuple[HTTPConnection, HTTPResponse]:
+        while True:
+            conn, reused = self._acquire(key)
+            if reused:
+                self._count(key, requests=1, reused=1)
+            else:
+                self._count(key, requests=1, connections=1)
+
+            try:
+                conn.request(method, target, body=body, headers=headers)
+                return conn, conn.getresponse()
+            except (HTTPException, ConnectionError):
+                conn.close()
+                # Idle keep-alive connections may have been dropped by the server
+                if not reused:
+                    self._count(key, errors=1)
+                    raise
+            except Exception:
+                conn.close()
+                self._count(key, errors=1)
+                raise
+
+    def urlopen(
+        self,
+        url: Union[str, request.Request],
+        *,
+        method: Optional[str] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Response:
+        if isinstance(url, request.Request):
+            req = url
+        else:
+            req = request.Request(url, headers=headers or {}, method=method)
+
+        full_url = req.full_url
+        if _use_urllib(full_url):
+            # Leave proxied and non HTTP requests to urllib
+            return request.urlopen(req, timeout=self.timeout)  # noqa: S310
+
+        method = req.get_method()
+        req_headers = dict(req.header_items())
+        body = req.data
+
+        for _ in range(self.max_redirects + 1):
+            parts = urlsplit(full_url)
+            key = (parts.scheme.lower(), parts.hostname, parts.port)
+            target = parts.path or "/"
+            if parts.query:
+                target = f"{target}?{parts.query}"
+
+            try:
+                conn, response = self._send(key, method, target, body, req_headers)
+            except (HTTPException, OSError) as e:
+                raise URLError(e) from e
+
+            location = response.headers.get("Location")
+            if response.status in _REDIRECT_CODES and location:
+                response.read()
+                self._release(key, conn, not response.will_close)
+                self._count(key, redirects=1)
+                full_url = urljoin(full_url, location)
+                if response.status == 303 or (
+                    response.status in (301, 302) and method == "POST"
+                ):
+                    method = "GET"
+                    body = None
+                continue
+
+            if not 200 <= response.status < 300:
+                content = response.read()
+                self._release(key, conn, not response.will_close)
+                raise HTTPError(
+                    full_url,
+                    response.status,
+                    response.reason,
+                    response.headers,
+                    BytesIO(content),
+                )
+
+            return PooledResponse(response, full_url, partial(self._release, key, conn))
+
+        raise URLError(f"Too many redirects for {req.full_url}")
+
+    def stats(self) -> Dict[str, HostStats]:
+        with self._lock:
+            return {
+                host: HostStats(host=host, **counts)
+                for host, counts in self._stats.items()
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for conn in connections:
+                conn.close()
+
+
+_default_pool = ConnectionPool()
+
+
+def get_pool() -> ConnectionPool:
+    return _default_pool
+
+
+def urlopen(
+    url: Union[str, request.Request],
+    *,
+    method: Optional[str] = None,
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    return _default_pool.urlopen(url, method=method, headers=headers)
+
+
+def stats() -> Dict[str, HostStats]:
+    return _default_pool.stats()
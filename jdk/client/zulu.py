@@ -1,9 +1,12 @@
 import json
+from hashlib import sha256
+from typing import Any
+from typing import Dict
 from typing import List
 from typing import Optional
 from typing import Union
 from urllib.parse import urlencode
-from urllib.request import urlopen
+from urllib.parse import urljoin
 
 from jdk.enums import Architecture
 from jdk.enums import BaseDetectableEnum
@@ -17,39 +20,30 @@ from jdk.extension import extends
 
 from .client import Client
 from .client import ClientError
+from .client import Resolution
+from .client import ResolutionSpec
 from .client import vendor_client
+from .pool import urlopen
 
 
-@extends(OperatingSystem)
+@extends(OperatingSystem, translate={OperatingSystem.MAC: "macos"})
 class ZuluOperatingSystem(BaseDetectableEnum):
     @classmethod
     def detect(cls) -> Optional["ZuluOperatingSystem"]:
         operating_system = OperatingSystem.detect()
         return cls.transform(operating_system)
 
-    @classmethod
-    def transform(cls, other: OperatingSystem) -> Optional["ZuluOperatingSystem"]:
-        if other == OperatingSystem.MAC:
-            return ZuluOperatingSystem.MACOS
-        return ZuluOperatingSystem(other.value)
-
     MACOS = "macos"
     QNX = "qnx"
 
 
-@extends(Architecture)
+@extends(Architecture, translate={Architecture.X64: "x86"})
 class ZuluArchitecture(BaseDetectableEnum):
     @classmethod
     def detect(cls) -> Optional["ZuluArchitecture"]:
         arch = Architecture.detect()
         return cls.transform(arch)
 
-    @classmethod
-    def transform(cls, other: Architecture) -> Optional["ZuluArchitecture"]:
-        if other == Architecture.X64:
-            return ZuluArchitecture(Architecture.X86.value)
-        return ZuluArchitecture(other.value)
-
     MIPS = "mips"
     PPC = "ppc"
     SPARCV9 = "sparcv9"
@@ -122,6 +116,11 @@ class ZuluEnvironment(BaseEnum):
     PRODUCTION = "https://api.azul.com/zulu/download/community/v1.0"
 
 
+def mirror_bundle_path(query: str) -> str:
+    # Static servers ignore query strings, so each query gets its own file
+    return f"bundles/latest/{sha256(query.encode('utf-8')).hexdigest()}.json"
+
+
 @extends(Vendor)
 class ZuluVendor(BaseEnum):
     ZULU = "zulu"
@@ -134,8 +133,38 @@ class ZuluClient(Client):
         if environment == Environment.DEFAULT:
             base_url = ZuluEnvironment.PRODUCTION.value
         else:
-            base_url = environment.value
+            base_url = str(environment)
         super().__init__(base_url)
+        self._checksums = dict()
+        self._queries = dict()
+        self._sizes = dict()
+
+    def get_checksum(self, download_url: str) -> Optional[str]:
+        return self._checksums.get(download_url)
+
+    def bundle_query(self, download_url: str) -> Optional[str]:
+        return self._queries.get(download_url)
+
+    def _resolution(self, download_url: str) -> Dict[str, Any]:
+        return {
+            "url": download_url,
+            "checksum": self._checksums.get(download_url),
+            "query": self._queries.get(download_url),
+            "size": self._sizes.get(download_url),
+        }
+
+    def _restore_resolution(self, resolution: Dict[str, Any]) -> None:
+        if resolution.get("checksum"):
+            self._checksums[resolution["url"]] = resolution["checksum"]
+        if resolution.get("query"):
+            self._queries[resolution["url"]] = resolution["query"]
+        if resolution.get("size"):
+            self._sizes[resolution["url"]] = resolution["size"]
+
+    def resolve(self, spec: ResolutionSpec) -> Resolution:
+        # Bundle lookups report the archive size along with its checksum
+        resolution = super().resolve(spec)
+        return resolution._replace(size=self._sizes.get(resolution.url))
 
     def get_download_url(
         self,
@@ -187,15 +216,24 @@ class ZuluClient(Client):
         params["support_term"] = support_term if support_term else ZuluSupportTerm.LTS
         params["features"] = ",".join([str(feature).lower() for feature in features])
 
-        qry_str = urlencode(params)
-        qry_url = f"{self._base_url}/bundles/latest/?{qry_str}"
+        return self._query_bundle(urlencode(params))
+
+    def _query_bundle(self, qry_str: str) -> Optional[str]:
+        if self.mirror:
+            qry_url = f"{self._base_url}/{mirror_bundle_path(qry_str)}"
+        else:
+            qry_url = f"{self._base_url}/bundles/latest/?{qry_str}"
 
         try:
-            data = json.loads(
-                urlopen(qry_url).read().decode("utf-8")  # noqa: S310 Known URL
-            )
+            data = json.loads(urlopen(qry_url).read().decode("utf-8"))
         except Exception as e:
             raise ClientError(e) from e
-        else:
-            if data and "url" in data:
-                return data["url"]
+
+        if not data or "url" not in data:
+            return None
+        # Mirrors publish bundle urls relative to the bundle file
+        download_url = urljoin(qry_url, data["url"])
+        self._checksums[download_url] = data.get("sha256_hash")
+        self._queries[download_url] = qry_str
+        self._sizes[download_url] = data.get("size")
+        return download_url
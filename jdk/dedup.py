@@ -0,0 +1,153 @@
+import json
+import os
+import shutil
+import sys
+from collections import namedtuple
+from hashlib import sha256
+from os import path as ospath
+from stat import S_ISREG
+from typing import Any
+from typing import Dict
+from typing import Optional
+
+from jdk.filelock import FileLock
+
+
+_INDEX_FILE = ".dedup-index.json"
+_CHUNK_SIZE = 1024 * 1024
+# Linux ioctl number for a copy-on-write clone of a whole file (btrfs, xfs)
+_FICLONE = 0x40049409
+# Files here, such as conf/** and lib/security/cacerts, are edited in place by users
+_EDITABLE_DIRS = frozenset(("conf", "security"))
+# Only files the JDK never writes to may share an inode with another install
+_READ_ONLY_NAMES = frozenset(("modules",))
+_READ_ONLY_EXTS = frozenset((".so", ".dylib", ".dll", ".jsa"))
+
+
+DedupResult = namedtuple("DedupResult", "files linked bytes_saved")
+
+
+class DedupError(Exception):
+    pass
+
+
+def _file_hash(file: str) -> str:
+    digest = sha256()
+    with open(file, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _load_index(index_file: str) -> Dict[str, Dict[str, Any]]:
+    try:
+        with open(index_file) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_index(index_file: str, index: Dict[str, Dict[str, Any]]) -> None:
+    live = {key: entry for key, entry in index.items() if ospath.isfile(entry["path"])}
+    tmp_file = f"{index_file}.{os.getpid()}.tmp"
+    with open(tmp_file, "w") as f:
+        json.dump(live, f)
+    os.replace(tmp_file, index_file)
+
+
+def _reflink(source: str, target: str) -> bool:
+    if not sys.platform.startswith("linux"):
+        return False
+
+    import fcntl
+
+    try:
+        with open(source, "rb") as src, open(target, "wb") as dst:
+            fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+    except OSError:
+        if ospath.exists(target):
+            os.remove(target)
+        return False
+    return True
+
+
+def _is_read_only(file: str, root: str) -> bool:
+    parent, name = ospath.split(ospath.relpath(file, root))
+    if _EDITABLE_DIRS.intersection(parent.split(os.sep)):
+        return False
+    return name in _READ_ONLY_NAMES or ospath.splitext(name)[1] in _READ_ONLY_EXTS
+
+
+def _replace_with_link(source: str, target: str, use_reflink: bool, root: str) -> bool:
+    tmp_file = f"{target}.dedup.tmp"
+    if use_reflink and _reflink(source, tmp_file):
+        shutil.copystat(target, tmp_file)
+    else:
+        # A hardlinked file edited in one install would change in every other one
+        if not (_is_read_only(source, root) and _is_read_only(target, root)):
+            return False
+        # Hardlinks share permissions, so only link files whose modes agree
+        if os.stat(source).st_mode != os.stat(target).st_mode:
+            return False
+        try:
+            os.link(source, tmp_file)
+        except OSError:
+            return False
+    os.replace(tmp_file, target)
+    return True
+
+
+def dedupe(
+    directory: str, index_root: Optional[str] = None, *, reflink: bool = True
+) -> DedupResult:
+    directory = ospath.abspath(directory)
+    index_root = index_root or ospath.dirname(directory)
+    index_file = ospath.join(index_root, _INDEX_FILE)
+    with FileLock(f"{index_file}.lock"):
+        return _dedupe(directory, index_file, reflink)
+
+
+def _dedupe(directory: str, index_file: str, reflink: bool) -> DedupResult:
+    index = _load_index(index_file)
+
+    files = linked = bytes_saved = 0
+    try:
+        for root, _, names in os.walk(directory):
+            for name in names:
+                file = ospath.join(root, name)
+                st = os.lstat(file)
+                if not S_ISREG(st.st_mode) or not st.st_size:
+                    continue
+
+                files += 1
+                key = f"{st.st_size}:{_file_hash(file)}"
+                entry = index.get(key)
+                if entry and entry["path"] != file and _is_current(entry, key):
+                    existing = os.stat(entry["path"])
+                    same_device = existing.st_dev == st.st_dev
+                    if existing.st_ino == st.st_ino or not same_device:
+                        continue
+                    root = ospath.dirname(index_file)
+                    if _replace_with_link(entry["path"], file, reflink, root):
+                        linked += 1
+                        bytes_saved += st.st_size
+                else:
+                    index[key] = {"path": file, "mtime": st.st_mtime}
+    except OSError as e:
+        raise DedupError(e) from e
+    finally:
+        _save_index(index_file, index)
+
+    return DedupResult(files=files, linked=linked, bytes_saved=bytes_saved)
+
+
+def _is_current(entry: Dict[str, Any], key: str) -> bool:
+    try:
+        st = os.stat(entry["path"])
+    except OSError:
+        return False
+
+    if st.st_mtime == entry["mtime"]:
+        return True
+    # The indexed file changed since it was recorded, so confirm its content
+    return f"{st.st_size}:{_file_hash(entry['path'])}" == key
@@ -1,17 +1,29 @@
+import os
 from enum import Enum
+from enum import EnumMeta
+from functools import lru_cache
 from typing import Any
 from typing import Optional
 
 
-class BaseEnum(str, Enum):
-    def __contains__(self, obj: object) -> bool:
-        try:
-            self(obj)
-        except ValueError:
-            return False
-        else:
-            return True
+@lru_cache(maxsize=None)
+def _machine() -> str:
+    # os.uname avoids importing platform, which is slow to import
+    if hasattr(os, "uname"):
+        return os.uname().machine.lower()
+
+    from platform import machine
+
+    return machine().lower()
+
 
+class _BaseEnumMeta(EnumMeta):
+    def __contains__(cls, obj: object) -> bool:
+        value = obj.value if isinstance(obj, Enum) else obj
+        return value in cls._value2member_map_
+
+
+class BaseEnum(str, Enum, metaclass=_BaseEnumMeta):
     def __str__(self) -> str:
         return self.value
 
@@ -20,6 +32,10 @@ class BaseEnum(str, Enum):
             return self.value == other.value
         return False
 
+    # Members of extended enums compare equal by value, so they must hash by value
+    def __hash__(self) -> int:
+        return hash(self.value)
+
 
 class BaseDetectableEnum(BaseEnum):
     @classmethod
@@ -49,9 +65,7 @@ class Environment(BaseEnum):
 class Architecture(BaseDetectableEnum):
     @classmethod
     def detect(cls) -> Optional["Architecture"]:
-        from platform import machine
-
-        machine_arch = machine().lower()
+        machine_arch = _machine()
         if "arm" in machine_arch:
             return Architecture.ARM
         if "aarch64" in machine_arch:
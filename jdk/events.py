@@ -0,0 +1,103 @@
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+from threading import Lock
+from typing import Callable
+from typing import Iterator
+from typing import List
+from typing import Optional
+
+
+RESOLVE = "resolve"
+CHECKSUM = "checksum"
+DOWNLOAD = "download"
+EXTRACT = "extract"
+UNPACK = "unpack200"
+DEDUP = "dedup"
+
+START = "start"
+PROGRESS = "progress"
+END = "end"
+FAILED = "failed"
+
+Event = namedtuple("Event", "phase status url bytes total elapsed")
+PhaseTiming = namedtuple("PhaseTiming", "phase elapsed bytes")
+InstallSummary = namedtuple("InstallSummary", "path url phases elapsed")
+
+EventCallback = Callable[[Event], None]
+ProgressCallback = Callable[[int, Optional[int]], None]
+
+
+def progress_counter(
+    progress: Optional[ProgressCallback], total: Optional[int] = None
+) -> Callable[[int], None]:
+    if progress is None:
+        return lambda size: None
+
+    lock = Lock()
+    done = 0
+
+    # Work done on several threads is reported as one running total
+    def advance(size: int) -> None:
+        nonlocal done
+        with lock:
+            done += size
+            progress(done, total)
+
+    return advance
+
+
+class Phase:
+    def __init__(self, timer: "PhaseTimer", name: str) -> None:
+        self.name = name
+        self.bytes = None
+        self.total = None
+        self._timer = timer
+        self._start = time.monotonic()
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self._start
+
+    def progress(self, done: int, total: Optional[int] = None) -> None:
+        self.bytes = done
+        self.total = total
+        self._timer._emit(self, PROGRESS)
+
+
+class PhaseTimer:
+    def __init__(
+        self, callback: Optional[EventCallback] = None, url: Optional[str] = None
+    ) -> None:
+        self.url = url
+        self.phases: List[PhaseTiming] = []
+        self._callback = callback
+        self._lock = Lock()
+        self._start = time.monotonic()
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self._start
+
+    def _emit(self, phase: Phase, status: str) -> None:
+        if self._callback is not None:
+            event = Event(
+                phase.name, status, self.url, phase.bytes, phase.total, phase.elapsed
+            )
+            self._callback(event)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[Phase]:
+        phase = Phase(self, name)
+        self._emit(phase, START)
+        try:
+            yield phase
+        except BaseException:
+            self._emit(phase, FAILED)
+            raise
+        with self._lock:
+            self.phases.append(PhaseTiming(name, phase.elapsed, phase.bytes))
+        self._emit(phase, END)
+
+    def summary(self, path: str) -> InstallSummary:
+        return InstallSummary(path, self.url, list(self.phases), self.elapsed)
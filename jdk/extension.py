@@ -1,15 +1,36 @@
 import warnings
-from enum import EnumMeta
+from enum import Enum
 from functools import wraps
-from inspect import isclass
-from inspect import isfunction
+from types import FunctionType
+from types import MappingProxyType
+from typing import Any
 from typing import Callable
+from typing import Mapping
+from typing import Optional
 from typing import Union
 
 from jdk.enums import BaseDetectableEnum
 from jdk.enums import BaseEnum
 
 
+def _translation_table(
+    extended_enum: BaseDetectableEnum, translate: Optional[Mapping[Enum, str]]
+) -> Mapping[str, BaseDetectableEnum]:
+    table = {member.value: member for member in extended_enum}
+    for source, target in (translate or {}).items():
+        table[source.value] = extended_enum(target)
+    return MappingProxyType(table)
+
+
+def _transform(cls: Any, other: Any) -> BaseDetectableEnum:
+    # _value_ is a plain attribute, where value goes through a descriptor
+    value = other._value_ if isinstance(other, Enum) else other
+    member = cls._translation_table.get(value)
+    if member is None:
+        raise ValueError(f"{value!r} is not a valid {cls.__name__}")
+    return member
+
+
 def extend_enum(parent: BaseEnum) -> Callable[[BaseEnum], BaseEnum]:
     @wraps(parent)
     def wrapper(extended: BaseEnum) -> BaseEnum:
@@ -24,7 +45,7 @@ def extend_enum(parent: BaseEnum) -> Callable[[BaseEnum], BaseEnum]:
 
 
 def extend_detectable_enum(
-    parent: BaseDetectableEnum,
+    parent: BaseDetectableEnum, translate: Optional[Mapping[Enum, str]] = None
 ) -> Callable[[BaseDetectableEnum], BaseDetectableEnum]:
     @wraps(parent)
     def wrapper(extended: BaseDetectableEnum) -> BaseDetectableEnum:
@@ -34,15 +55,22 @@ def extend_detectable_enum(
         for item in extended:
             joined[item.name] = item.value
         extended_enum = BaseDetectableEnum(extended.__name__, joined)
-        extended_enum.detect = extended.detect
-        extended_enum.transform = extended.transform
+        # Rebinding to the generated enum lets detect use its transform
+        extended_enum.detect = classmethod(extended.detect.__func__)
+        # Values are translated through a table built once, instead of per call
+        extended_enum._translation_table = _translation_table(extended_enum, translate)
+        if "transform" in vars(extended):
+            extended_enum.transform = extended.transform
+        else:
+            extended_enum.transform = classmethod(_transform)
         return extended_enum
 
     return wrapper
 
 
 def extends(
-    parent: Union[BaseEnum, BaseDetectableEnum]
+    parent: Union[BaseEnum, BaseDetectableEnum],
+    translate: Optional[Mapping[Enum, str]] = None,
 ) -> Callable[
     [Union[BaseEnum, BaseDetectableEnum]], Union[BaseEnum, BaseDetectableEnum]
 ]:
@@ -50,14 +78,10 @@ def extends(
     def wrapper(
         extended: Union[BaseEnum, BaseDetectableEnum]
     ) -> Union[BaseEnum, BaseDetectableEnum]:
-        parent_type = type(parent)
-        if parent_type is EnumMeta:
-            first_value = list(parent)[0]
-            first_enum = parent(first_value)
-            if isinstance(first_enum, BaseDetectableEnum):
-                return extend_detectable_enum(parent)(extended)
-            if isinstance(first_enum, BaseEnum):
-                return extend_enum(parent)(extended)
+        if isinstance(parent, type) and issubclass(parent, BaseDetectableEnum):
+            return extend_detectable_enum(parent, translate)(extended)
+        if isinstance(parent, type) and issubclass(parent, BaseEnum):
+            return extend_enum(parent)(extended)
         raise NotImplementedError(f"{extended.__class__.__name__} can not be extended")
 
     return wrapper
@@ -68,7 +92,7 @@ def deprecated(reason):
 
         def decorator(func):
             msg = "Call to deprecated function {name} ({reason})"
-            if isclass(func):
+            if isinstance(func, type):
                 msg = "Call to deprecated class {name} ({reason})"
 
             @wraps(func)
@@ -85,10 +109,10 @@ def deprecated(reason):
             return wrapper
 
         return decorator
-    elif isclass(reason) or isfunction(reason):
+    elif isinstance(reason, (type, FunctionType)):
         _func = reason
         msg = "Call to deprecated function {name}"
-        if isclass(_func):
+        if isinstance(_func, type):
             msg = "Call to deprecated class {name}"
 
         @wraps(_func)
@@ -1,16 +1,42 @@
+import posixpath
+import re
 from contextlib import closing
-from lzma import LZMAFile
-from lzma import open as lzma_open
+from fnmatch import translate
+from os import chmod
+from os import link
 from os import listdir
+from os import makedirs
 from os import path as ospath
+from os import remove
 from os import stat
-from tarfile import TarFile
-from tarfile import open as tarfile_open
+from os import symlink
+from os import utime
+from stat import S_ISLNK
+from threading import BoundedSemaphore
+from typing import IO
+from typing import TYPE_CHECKING
+from typing import Callable
 from typing import Iterable
+from typing import Iterator
+from typing import List
 from typing import Optional
+from typing import Sequence
+from typing import Set
+from typing import Tuple
 from typing import Union
-from zipfile import ZipFile
-from zipfile import ZipInfo
+
+from jdk.events import ProgressCallback
+from jdk.events import progress_counter
+
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+    from concurrent.futures import Future
+    from lzma import LZMAFile
+    from tarfile import TarFile
+    from tarfile import TarInfo
+    from zipfile import ZipFile
+    from zipfile import ZipInfo
 
 
 _TAR = ".tar"
@@ -18,11 +44,103 @@ _TAR_GZ = ".tar.gz"
 _ZIP = ".zip"
 _SEVEN_ZIP = ".7z"
 
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZIP_MAGIC = b"PK\x03\x04"
+_TAR_MAGIC = b"ustar"
+_TAR_MAGIC_OFFSET = 257
+
+_COPY_BUFFER_SIZE = 1024 * 1024
+# Members larger than this are written by the decompressing thread itself
+_INLINE_SIZE = 16 * 1024 * 1024
+
+# Patterns match paths below the JDK root, and a matching directory covers its contents
+_NO_SOURCES = ("src.zip", "lib/src.zip")
+_PROFILES = {
+    "no-sources": _NO_SOURCES,
+    "runtime-minimal": (
+        *_NO_SOURCES,
+        "demo",
+        "sample",
+        "man",
+        "legal",
+        "jmods",
+        "include",
+        "*.diz",
+    ),
+}
+# macOS archives nest the JDK in an application bundle
+_BUNDLE_HOME = ["Contents", "Home"]
+
+MemberFilter = Callable[[str], bool]
+
 
 class ExtractorError(Exception):
     pass
 
 
+def _patterns(
+    patterns: Optional[Union[str, Iterable[str]]], profiles: bool = False
+) -> List[str]:
+    if patterns is None:
+        return []
+    if isinstance(patterns, str):
+        patterns = [patterns]
+
+    expanded = []
+    for pattern in patterns:
+        if pattern in _PROFILES and not profiles:
+            # Profiles list what to leave out, so including one would invert it
+            raise ValueError(f"Profile {pattern!r} can only be used with exclude")
+        expanded.extend(_PROFILES.get(pattern, [pattern]))
+    return expanded
+
+
+def _compile(patterns: Sequence[str]) -> Optional["re.Pattern[str]"]:
+    if not patterns:
+        return None
+    return re.compile("|".join(translate(pattern) for pattern in patterns))
+
+
+def _jdk_parts(name: str) -> List[str]:
+    parts = [part for part in name.split("/") if part not in ("", ".")][1:]
+    if parts[: len(_BUNDLE_HOME)] == _BUNDLE_HOME:
+        return parts[len(_BUNDLE_HOME) :]
+    return parts
+
+
+def _matches(regex: "re.Pattern[str]", parts: List[str]) -> bool:
+    return any(
+        regex.match("/".join(parts[:depth])) for depth in range(1, len(parts) + 1)
+    )
+
+
+def member_filter(
+    include: Optional[Union[str, Iterable[str]]] = None,
+    exclude: Optional[Union[str, Iterable[str]]] = None,
+) -> Optional[MemberFilter]:
+    included = _compile(_patterns(include))
+    excluded = _compile(_patterns(exclude, profiles=True))
+    if included is None and excluded is None:
+        return None
+
+    def keep(name: str) -> bool:
+        parts = _jdk_parts(name)
+        if not parts:
+            return True
+        if included is not None and not _matches(included, parts):
+            return False
+        return excluded is None or not _matches(excluded, parts)
+
+    return keep
+
+
+def _keep_member(keep: Optional[MemberFilter], member: "TarInfo") -> bool:
+    if keep is None:
+        return True
+    # A hard link is only extracted with the file it points to
+    return keep(member.name) and not (member.islnk() and not keep(member.linkname))
+
+
 def _is_within_directory(directory: str, target: str):
     abs_directory = ospath.abspath(directory)
     abs_target = ospath.abspath(target)
@@ -32,20 +150,319 @@ def _is_within_directory(directory: str, target: str):
 
 
 def _safe_extract(
-    tar: Union[TarFile, ZipFile, LZMAFile],
+    tar: Union["TarFile", "ZipFile", "LZMAFile"],
     path: Optional[str] = None,
-    members: Optional[Iterable[Union[str, ZipInfo]]] = None,
+    members: Optional[Iterable[Union[str, "ZipInfo"]]] = None,
     *,
     numeric_owner: bool = False,
-):
+    keep: Optional[MemberFilter] = None,
+    progress: Optional[ProgressCallback] = None,
+) -> Set[str]:
+    from zipfile import ZipFile
+
+    advance = progress_counter(progress)
     if isinstance(tar, ZipFile):
-        tar.extractall(path)
+        infos = tar.infolist()
+        if members is not None:
+            infos = [tar.getinfo(m) if isinstance(m, str) else m for m in members]
+        for info in infos:
+            if keep is None or keep(info.filename):
+                tar.extract(info, path)
+                advance(info.file_size)
+        return {_root_name(name) for name in tar.namelist()}
     else:
+        links = _LinkCheck()
         for member in tar.getmembers():
-            member_path = ospath.join(path, member.name)
-            if not _is_within_directory(path, member_path):
-                raise ExtractorError("Attempted Path Traversal in Archive File")
-        tar.extractall(path, members, numeric_owner=numeric_owner)
+            _check_member(path, member, links)
+        members = [m for m in members or tar.getmembers() if _keep_member(keep, m)]
+        tar.extractall(path, _reported(members, advance), numeric_owner=numeric_owner)
+        return {_root_name(member.name) for member in tar.getmembers()}
+
+
+def _reported(
+    members: Iterable["TarInfo"], advance: Callable[[int], None]
+) -> Iterator["TarInfo"]:
+    # Resumed once tarfile has written the member and asks for the next one
+    for member in members:
+        yield member
+        advance(member.size)
+
+
+def _check_member(path: str, member: "TarInfo", links: "_LinkCheck") -> None:
+    member_path = _check_name(path, member.name)
+    # Links may only point at other members of the archive
+    if member.issym():
+        _check_name(path, ospath.join(ospath.dirname(member_path), member.linkname))
+        links.add(member.name, member.linkname)
+    elif member.islnk():
+        _check_name(path, member.linkname)
+        links.add(member.name)
+        links.follow(member.linkname)
+    else:
+        links.add(member.name)
+
+
+class _LinkCheck:
+    # Names are only checked as text, so nothing may be written or resolved through
+    # a symlink the archive itself creates, whatever order the members come in
+    def __init__(self) -> None:
+        self._links: Set[str] = set()
+        self._parents: Set[str] = set()
+
+    def _walk(self, name: str) -> Tuple[str, Set[str]]:
+        parts: List[str] = []
+        parents = set()
+        for part in name.split("/"):
+            if part == "..":
+                if "/".join(parts) in self._links:
+                    raise ExtractorError(f"Archive path {name} leaves a symbolic link")
+                parts = parts[:-1]
+            elif part not in ("", "."):
+                if parts:
+                    parents.add("/".join(parts))
+                parts.append(part)
+        return "/".join(parts), parents
+
+    def follow(self, name: str) -> None:
+        _, parents = self._walk(name)
+        if not self._links.isdisjoint(parents):
+            raise ExtractorError(f"Archive path {name} is inside a symbolic link")
+        self._parents.update(parents)
+
+    def add(self, name: str, linkname: Optional[str] = None) -> None:
+        name, parents = self._walk(name)
+        if not self._links.isdisjoint(parents):
+            raise ExtractorError(f"Archive member {name} is inside a symbolic link")
+        if linkname is not None:
+            if name in self._parents:
+                raise ExtractorError(f"Archive member {name} replaces a directory")
+            self.follow(posixpath.join(posixpath.dirname(name), linkname))
+            self._links.add(name)
+        self._parents.update(parents)
+
+
+def _root_name(name: str) -> str:
+    parts = [part for part in name.split("/") if part not in ("", ".")]
+    return parts[0] if parts else ""
+
+
+def _root_directory(destination_folder: str, roots: Set[str]) -> str:
+    roots.discard("")
+    if len(roots) == 1:
+        return ospath.join(destination_folder, roots.pop())
+
+    # Fall back to the most recently changed entry for archives without a single root
+    jdk_directory = max(
+        listdir(destination_folder),
+        key=lambda d: stat(ospath.join(destination_folder, d)).st_ctime,
+    )
+    return ospath.join(destination_folder, jdk_directory)
+
+
+def _check_name(path: str, name: str) -> str:
+    target = ospath.join(path, name)
+    if not _is_within_directory(path, target):
+        raise ExtractorError("Attempted Path Traversal in Archive File")
+    return target
+
+
+def _zip_mode(info: "ZipInfo") -> int:
+    return info.external_attr >> 16
+
+
+def _extract_zip_batch(
+    file: str, infos: List["ZipInfo"], path: str, advance: Callable[[int], None]
+) -> None:
+    from shutil import copyfileobj
+    from zipfile import ZipFile
+
+    with ZipFile(file) as z:
+        for info in infos:
+            target = _check_name(path, info.filename)
+            makedirs(ospath.dirname(target), exist_ok=True)
+            with z.open(info) as source, open(target, "wb") as out_file:
+                copyfileobj(source, out_file, _COPY_BUFFER_SIZE)
+
+            mode = _zip_mode(info) & 0o7777
+            if mode:
+                chmod(target, mode)
+            advance(info.file_size)
+
+
+def _parallel_extract_zip(
+    file: str,
+    path: str,
+    workers: int,
+    keep: Optional[MemberFilter] = None,
+    progress: Optional[ProgressCallback] = None,
+) -> Set[str]:
+    from concurrent.futures import ThreadPoolExecutor
+    from zipfile import ZipFile
+
+    files = []
+    links = []
+    checked = _LinkCheck()
+    with ZipFile(file) as z:
+        infos = z.infolist()
+        for info in infos:
+            if keep is not None and not keep(info.filename):
+                continue
+            target = _check_name(path, info.filename)
+            if info.is_dir():
+                checked.add(info.filename)
+                makedirs(target, exist_ok=True)
+            elif S_ISLNK(_zip_mode(info)):
+                link_target = z.read(info).decode("utf-8")
+                _check_name(path, ospath.join(ospath.dirname(target), link_target))
+                checked.add(info.filename, link_target)
+                links.append((target, link_target))
+            else:
+                checked.add(info.filename)
+                files.append(info)
+
+    # Spread the largest entries first so no worker ends up with all the big files
+    batches = [[] for _ in range(workers)]
+    files.sort(key=lambda i: i.file_size, reverse=True)
+    for index, info in enumerate(files):
+        batches[index % workers].append(info)
+
+    advance = progress_counter(progress)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_extract_zip_batch, file, batch, path, advance)
+            for batch in batches
+            if batch
+        ]
+        for future in futures:
+            future.result()
+
+    for target, link_target in links:
+        makedirs(ospath.dirname(target), exist_ok=True)
+        if ospath.lexists(target):
+            remove(target)
+        symlink(link_target, target)
+
+    return {_root_name(info.filename) for info in infos}
+
+
+def _write_member(target: str, data: bytes, member: "TarInfo") -> None:
+    makedirs(ospath.dirname(target), exist_ok=True)
+    with open(target, "wb") as out_file:
+        out_file.write(data)
+    _set_attrs(target, member)
+
+
+def _set_attrs(target: str, member: "TarInfo") -> None:
+    chmod(target, member.mode & 0o7777)
+    utime(target, (member.mtime, member.mtime))
+
+
+class _TarWriter:
+    def __init__(
+        self, executor: "Executor", workers: int, advance: Callable[[int], None]
+    ) -> None:
+        self._executor = executor
+        self._in_flight = BoundedSemaphore(workers * 4)
+        self._advance = advance
+        self._futures = []
+
+    def _release(self, _: "Future") -> None:
+        self._in_flight.release()
+
+    def write(self, tar: "TarFile", member: "TarInfo", target: str) -> None:
+        from shutil import copyfileobj
+
+        source = tar.extractfile(member)
+        if member.size > _INLINE_SIZE:
+            makedirs(ospath.dirname(target), exist_ok=True)
+            with open(target, "wb") as out_file:
+                copyfileobj(source, out_file, _COPY_BUFFER_SIZE)
+            _set_attrs(target, member)
+        else:
+            data = source.read()
+            self._in_flight.acquire()
+            future = self._executor.submit(_write_member, target, data, member)
+            future.add_done_callback(self._release)
+            self._futures.append(future)
+        self._advance(member.size)
+
+    def wait(self) -> None:
+        for future in self._futures:
+            future.result()
+
+
+def _link_member(path: str, target: str, member: "TarInfo") -> None:
+    makedirs(ospath.dirname(target), exist_ok=True)
+    if ospath.lexists(target):
+        remove(target)
+    if member.issym():
+        symlink(member.linkname, target)
+    else:
+        link(ospath.join(path, member.linkname), target)
+
+
+def _pipelined_extract_tar(
+    file: str,
+    mode: str,
+    path: str,
+    workers: int,
+    keep: Optional[MemberFilter] = None,
+    progress: Optional[ProgressCallback] = None,
+) -> Set[str]:
+    from concurrent.futures import ThreadPoolExecutor
+    from tarfile import open as tarfile_open
+
+    roots = set()
+    directories = []
+    links = []
+    checked = _LinkCheck()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # Decompression stays on this thread while the pool creates and writes files
+        writer = _TarWriter(executor, workers, progress_counter(progress))
+        with tarfile_open(file, mode) as tar:
+            for member in tar:
+                # Link targets are checked here, before anything is written
+                _check_member(path, member, checked)
+                roots.add(_root_name(member.name))
+                # Skipped members are never decompressed into memory or written
+                if not _keep_member(keep, member):
+                    continue
+                target = ospath.join(path, member.name)
+                if member.isdir():
+                    makedirs(target, exist_ok=True)
+                    directories.append((target, member))
+                elif member.isfile():
+                    writer.write(tar, member, target)
+                elif member.issym() or member.islnk():
+                    links.append((target, member))
+        writer.wait()
+
+    for target, member in links:
+        _link_member(path, target, member)
+
+    # Directory attributes are applied last, deepest first, as extractall does
+    for target, member in sorted(directories, key=lambda d: d[0], reverse=True):
+        _set_attrs(target, member)
+
+    return roots
+
+
+def _sniff_compressed_file_ext(file: str) -> str:
+    with open(file, "rb") as f:
+        header = f.read(_TAR_MAGIC_OFFSET + len(_TAR_MAGIC))
+
+    if header.startswith(_GZIP_MAGIC):
+        return _TAR_GZ
+    elif header.startswith(_ZIP_MAGIC):
+        return _ZIP
+    elif header[_TAR_MAGIC_OFFSET:].startswith(_TAR_MAGIC):
+        return _TAR
+    else:
+        return _SEVEN_ZIP
+
+
+def has_compressed_file_ext(file: str) -> bool:
+    return file.endswith((_TAR, _TAR_GZ, _ZIP, _SEVEN_ZIP))
 
 
 def get_compressed_file_ext(file: str) -> str:
@@ -55,29 +472,91 @@ def get_compressed_file_ext(file: str) -> str:
         return _TAR_GZ
     elif file.endswith(_ZIP):
         return _ZIP
+    elif not file.endswith(_SEVEN_ZIP) and ospath.isfile(file):
+        # Archives served without a file name, such as from a static mirror
+        return _sniff_compressed_file_ext(file)
     else:
         return _SEVEN_ZIP
 
 
+def can_stream(file_ending: str) -> bool:
+    return file_ending in (_TAR, _TAR_GZ)
+
+
+def extract_stream(
+    fileobj: IO[bytes],
+    file_ending: str,
+    destination_folder: str,
+    *,
+    include: Optional[Union[str, Iterable[str]]] = None,
+    exclude: Optional[Union[str, Iterable[str]]] = None,
+    progress: Optional[ProgressCallback] = None,
+) -> Optional[str]:
+    if not can_stream(file_ending):
+        raise ExtractorError(f"Unable to stream extract {file_ending} archives")
+
+    roots = set()
+    keep = member_filter(include, exclude)
+    links = _LinkCheck()
+
+    def checked_members(tar: "TarFile") -> Iterator["TarInfo"]:
+        for member in tar:
+            _check_member(destination_folder, member, links)
+            roots.add(_root_name(member.name))
+            if _keep_member(keep, member):
+                yield member
+
+    from tarfile import open as tarfile_open
+
+    mode = "r|gz" if file_ending == _TAR_GZ else "r|"
+    with tarfile_open(fileobj=fileobj, mode=mode) as tar:
+        members = _reported(checked_members(tar), progress_counter(progress))
+        tar.extractall(destination_folder, members)
+
+    return _root_directory(destination_folder, roots)
+
+
 def extract_files(
-    file: str, file_ending: str, destination_folder: str
+    file: str,
+    file_ending: str,
+    destination_folder: str,
+    *,
+    workers: int = 1,
+    include: Optional[Union[str, Iterable[str]]] = None,
+    exclude: Optional[Union[str, Iterable[str]]] = None,
+    progress: Optional[ProgressCallback] = None,
 ) -> Optional[str]:
     if ospath.isfile(file):
-        if file_ending == _TAR:
-            with tarfile_open(file, "r:") as tar:
-                _safe_extract(tar, path=destination_folder)
-        elif file_ending == _TAR_GZ:
-            with tarfile_open(file, "r:gz") as tar:
-                _safe_extract(tar, path=destination_folder)
+        roots = set()
+        keep = member_filter(include, exclude)
+        if workers > 1 and file_ending in (_TAR, _TAR_GZ):
+            mode = "r|gz" if file_ending == _TAR_GZ else "r|"
+            roots = _pipelined_extract_tar(
+                file, mode, destination_folder, workers, keep, progress
+            )
+        elif workers > 1 and file_ending == _ZIP:
+            roots = _parallel_extract_zip(
+                file, destination_folder, workers, keep, progress
+            )
+        elif file_ending in (_TAR, _TAR_GZ):
+            from tarfile import open as tarfile_open
+
+            mode = "r:gz" if file_ending == _TAR_GZ else "r:"
+            with tarfile_open(file, mode) as tar:
+                roots = _safe_extract(
+                    tar, path=destination_folder, keep=keep, progress=progress
+                )
         elif file_ending == _ZIP:
+            from zipfile import ZipFile
+
             with closing(ZipFile(file)) as z:
-                _safe_extract(z, path=destination_folder)
+                roots = _safe_extract(
+                    z, path=destination_folder, keep=keep, progress=progress
+                )
         elif file_ending == _SEVEN_ZIP:
+            from lzma import open as lzma_open
+
             with lzma_open(file) as z:
-                _safe_extract(z, path=destination_folder)
+                roots = _safe_extract(z, path=destination_folder)
 
-        jdk_directory = max(
-            listdir(destination_folder),
-            key=lambda d: stat(ospath.join(destination_folder, d)).st_ctime,
-        )
-        return ospath.join(destination_folder, jdk_directory)
+        return _root_directory(destination_folder, roots)
@@ -0,0 +1,143 @@
+import os
+import sys
+import time
+from hashlib import sha256
+from os import path as ospath
+from typing import Any
+from typing import Optional
+
+
+_LOCK_DIR = ".locks"
+_POLL_INTERVAL = 0.1
+
+
+class FileLockError(Exception):
+    pass
+
+
+class _FcntlLocking:
+    @staticmethod
+    def try_lock(fd: int) -> bool:
+        import fcntl
+
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+        return True
+
+    @staticmethod
+    def lock(fd: int) -> None:
+        import fcntl
+
+        fcntl.flock(fd, fcntl.LOCK_EX)
+
+    @staticmethod
+    def unlock(fd: int) -> None:
+        import fcntl
+
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+class _MsvcrtLocking:
+    @staticmethod
+    def try_lock(fd: int) -> bool:
+        import msvcrt
+
+        try:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        except OSError:
+            return False
+        return True
+
+    @classmethod
+    def lock(cls, fd: int) -> None:
+        # msvcrt has no blocking lock without a retry limit, so poll instead
+        while not cls.try_lock(fd):
+            time.sleep(_POLL_INTERVAL)
+
+    @staticmethod
+    def unlock(fd: int) -> None:
+        import msvcrt
+
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+_locking = _MsvcrtLocking if sys.platform == "win32" else _FcntlLocking
+
+
+class FileLock:
+    def __init__(
+        self, file: str, timeout: Optional[float] = None, delete: bool = False
+    ) -> None:
+        self.file = file
+        self.timeout = timeout
+        self.delete = delete
+        self._fd = None
+
+    def acquire(self) -> None:
+        os.makedirs(ospath.dirname(self.file) or ".", exist_ok=True)
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        while True:
+            # Every acquire opens its own descriptor, so threads exclude each other too
+            fd = os.open(self.file, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                self._lock(fd, deadline)
+            except BaseException:
+                os.close(fd)
+                raise
+            if not self.delete or self._is_current(fd):
+                break
+            # The holder deleted the file while we waited, so lock the new one
+            _locking.unlock(fd)
+            os.close(fd)
+        self._fd = fd
+
+    def _lock(self, fd: int, deadline: Optional[float]) -> None:
+        if deadline is None:
+            _locking.lock(fd)
+            return
+        while not _locking.try_lock(fd):
+            if time.monotonic() >= deadline:
+                raise FileLockError(f"Timed out waiting for {self.file}")
+            time.sleep(_POLL_INTERVAL)
+
+    def _is_current(self, fd: int) -> bool:
+        try:
+            return ospath.samestat(os.fstat(fd), os.stat(self.file))
+        except FileNotFoundError:
+            return False
+
+    def release(self) -> None:
+        if self._fd is not None:
+            fd, self._fd = self._fd, None
+            try:
+                if self.delete:
+                    self._remove()
+                _locking.unlock(fd)
+            finally:
+                os.close(fd)
+
+    def _remove(self) -> None:
+        try:
+            os.remove(self.file)
+        except OSError:
+            # Windows keeps open files, the next holder removes it instead
+            pass
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.release()
+
+
+def install_lock(path: str, url: str, timeout: Optional[float] = None) -> FileLock:
+    name = sha256(url.encode("utf-8")).hexdigest()
+    return FileLock(ospath.join(path, _LOCK_DIR, f"{name}.lock"), timeout)
+
+
+def publish_lock(path: str, name: str, timeout: Optional[float] = None) -> FileLock:
+    return FileLock(ospath.join(path, _LOCK_DIR, f"{name}.publish.lock"), timeout)
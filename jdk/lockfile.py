@@ -0,0 +1,120 @@
+import json
+import os
+from collections import namedtuple
+from os import path as ospath
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import Optional
+from typing import Tuple
+from urllib.parse import urlsplit
+
+from jdk.client.client import Client
+
+
+if TYPE_CHECKING:
+    from jdk.client.pool import Response
+
+
+LOCKFILE_VERSION = 1
+
+LockedBuild = namedtuple(
+    "LockedBuild",
+    "version vendor operating_system arch impl jre url checksum size",
+)
+Lockfile = namedtuple("Lockfile", "builds")
+
+
+class LockfileError(Exception):
+    pass
+
+
+class LockedClient(Client):
+    # Locked builds are downloaded and verified without any vendor metadata calls
+    def __init__(self, builds: Iterable[LockedBuild]) -> None:
+        super().__init__(None)
+        builds = list(builds)
+        self._checksums = {build.url: build.checksum for build in builds}
+        self._sizes = {build.url: build.size for build in builds}
+
+    def get_checksum(self, download_url: str) -> Optional[str]:
+        return self._checksums.get(download_url)
+
+    def open(
+        self,
+        download_url: str,
+        *,
+        method: str = "GET",
+        headers: Optional[Dict[str, str]] = None,
+    ) -> "Response":
+        response = super().open(download_url, method=method, headers=headers)
+        size = self._sizes.get(download_url)
+        length = response.headers.get("Content-Length")
+        # Range responses only carry part of the archive
+        if size is not None and length and response.getcode() == 200:
+            if int(length) != size:
+                response.close()
+                raise LockfileError(
+                    f"{download_url} is {length} bytes, but was locked at {size} bytes"
+                )
+        return response
+
+
+def locked_build(
+    args: Dict[str, Any], url: str, checksum: Optional[str], size: Optional[int]
+) -> LockedBuild:
+    return LockedBuild(
+        version=Client.normalize_version(str(args["version"])),
+        vendor=str(args["vendor"]),
+        operating_system=str(args["operating_system"]).lower(),
+        arch=str(args["arch"]).lower(),
+        impl=str(args["impl"]).lower(),
+        jre=bool(args["jre"]),
+        url=url,
+        checksum=checksum,
+        size=size,
+    )
+
+
+def resolve_download(download_url: str) -> Tuple[str, Optional[int]]:
+    with Client(None).open(download_url, method="HEAD") as response:
+        url = response.geturl()
+        length = response.headers.get("Content-Length")
+
+    # Links such as /latest/ redirect to the build they currently point at
+    if urlsplit(url).query and not urlsplit(download_url).query:
+        # Signed CDN links expire, so they are never pinned
+        url = download_url
+    return url, int(length) if length else None
+
+
+def write_lockfile(lockfile: Lockfile, file: str) -> None:
+    data = {
+        "version": LOCKFILE_VERSION,
+        "builds": [build._asdict() for build in lockfile.builds],
+    }
+    directory = ospath.dirname(ospath.abspath(file))
+    os.makedirs(directory, exist_ok=True)
+    tmp_file = f"{file}.{os.getpid()}.tmp"
+    with open(tmp_file, "w") as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+    os.replace(tmp_file, file)
+
+
+def read_lockfile(file: str) -> Lockfile:
+    try:
+        with open(file) as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        raise LockfileError(e) from e
+
+    if not isinstance(data, dict) or data.get("version") != LOCKFILE_VERSION:
+        raise LockfileError(f"Unsupported lockfile format in {file}")
+
+    try:
+        builds = [LockedBuild(**build) for build in data["builds"]]
+    except (KeyError, TypeError) as e:
+        raise LockfileError(f"Invalid lockfile {file}: {e}") from e
+    return Lockfile(builds)
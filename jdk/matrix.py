@@ -0,0 +1,49 @@
+from concurrent.futures import ThreadPoolExecutor
+from itertools import product
+from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+from jdk.enums import Architecture
+from jdk.enums import OperatingSystem
+from jdk.enums import Vendor
+
+
+Build = Tuple[Any, ...]
+
+
+def build_matrix(
+    versions: Iterable[str],
+    vendors: Iterable[Union[Vendor, str]],
+    operating_systems: Optional[Iterable[Union[OperatingSystem, str]]] = None,
+    architectures: Optional[Iterable[Union[Architecture, str]]] = None,
+    jre: bool = False,
+) -> List[Build]:
+    operating_systems = [
+        OperatingSystem(str(os_name))
+        for os_name in operating_systems or [OperatingSystem.detect()]
+    ]
+    architectures = [
+        Architecture(str(arch)) for arch in architectures or [Architecture.detect()]
+    ]
+    return list(product(vendors, versions, operating_systems, architectures, [jre]))
+
+
+def run_matrix(
+    func: Callable[..., Any], matrix: List[Build], max_workers: Optional[int] = None
+) -> List[Tuple[Build, Any, Optional[Exception]]]:
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(func, *build) for build in matrix]
+
+    # One failed build is reported with its entry instead of failing the matrix
+    results = []
+    for build, future in zip(matrix, futures):
+        try:
+            results.append((build, future.result(), None))
+        except Exception as e:
+            results.append((build, None, e))
+    return results
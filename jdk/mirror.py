@@ -0,0 +1,203 @@
+import json
+import os
+import posixpath
+import shutil
+from collections import namedtuple
+from functools import partial
+from os import path as ospath
+from threading import Lock
+from typing import Any
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Union
+from urllib.parse import urlsplit
+
+from jdk.checksum import discard
+from jdk.checksum import file_digest
+from jdk.checksum import matches
+from jdk.client import load_client
+from jdk.client.adoptium import AdoptiumClient
+from jdk.client.client import Client
+from jdk.client.corretto import _MIRROR_INDEX_MAP_PATH
+from jdk.client.corretto import CorrettoClient
+from jdk.client.zulu import ZuluClient
+from jdk.client.zulu import mirror_bundle_path
+from jdk.enums import Architecture
+from jdk.enums import OperatingSystem
+from jdk.enums import Vendor
+from jdk.matrix import build_matrix
+from jdk.matrix import run_matrix
+
+
+MirrorEntry = namedtuple(
+    "MirrorEntry", "vendor version operating_system arch jre path error"
+)
+
+# Several builds of one release share metadata files in the mirror
+_metadata_lock = Lock()
+
+
+class MirrorError(Exception):
+    pass
+
+
+def _vendor_path(client_class: type) -> str:
+    name = client_class.__name__
+    if name.endswith("Client"):
+        name = name[: -len("Client")]
+    return name.lower()
+
+
+def mirror_client(vendor: Optional[Union[Vendor, str]], mirror_url: str) -> Client:
+    client_class = load_client(vendor)
+    if client_class is None:
+        raise MirrorError(f"Unknown vendor {vendor}")
+
+    client = client_class(f"{mirror_url.rstrip('/')}/{_vendor_path(client_class)}")
+    client.mirror = True
+    return client
+
+
+def _write_json(file: str, data: Any) -> None:
+    os.makedirs(ospath.dirname(file), exist_ok=True)
+    tmp_file = f"{file}.{os.getpid()}.tmp"
+    with open(tmp_file, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp_file, file)
+
+
+def _local_path(root: str, url_path: str) -> str:
+    target = ospath.normpath(ospath.join(root, url_path.lstrip("/")))
+    if not target.startswith(ospath.join(root, "")):
+        raise MirrorError(f"{url_path} is outside of the mirror")
+    return target
+
+
+def _archive_path(client: Client, download_url: str, root: str) -> str:
+    if isinstance(client, ZuluClient):
+        file_name = posixpath.basename(urlsplit(download_url).path)
+        return _local_path(root, f"bin/{file_name}")
+    # Adoptium and Corretto archives keep the path their clients resolve to
+    return _local_path(root, urlsplit(download_url[len(client._base_url) :]).path)
+
+
+def _fetch_archive(
+    client: Client, download_url: str, checksum: Optional[str], target: str
+) -> None:
+    if checksum and ospath.isfile(target) and matches(file_digest(target), checksum):
+        return
+
+    jdk_file = client.download(download_url, checksum=checksum)
+    if not jdk_file:
+        raise MirrorError(f"Unable to download {download_url}")
+    try:
+        os.makedirs(ospath.dirname(target), exist_ok=True)
+        shutil.move(jdk_file, target)
+    finally:
+        discard(jdk_file)
+
+
+def _package(asset: Any) -> Any:
+    return asset.get("binary", {}).get("package", {})
+
+
+def _mirror_adoptium(
+    client: AdoptiumClient, download_url: str, root: str
+) -> Optional[str]:
+    loaded = client.load_assets(download_url)
+    if loaded is None:
+        return None
+
+    assets_path, params, assets = loaded
+    assets_file = _local_path(root, assets_path)
+    with _metadata_lock:
+        try:
+            with open(assets_file) as f:
+                mirrored = json.load(f)
+        except (OSError, ValueError):
+            mirrored = []
+
+        names = {_package(asset).get("name") for asset in mirrored}
+        for asset in assets:
+            name = _package(asset).get("name")
+            if client.match_asset(asset, params) and name not in names:
+                mirrored.append(asset)
+                names.add(name)
+        _write_json(assets_file, mirrored)
+
+    for asset in assets:
+        if client.match_asset(asset, params):
+            return _package(asset).get("checksum")
+    return None
+
+
+def _mirror_corretto(client: CorrettoClient, download_url: str, root: str) -> None:
+    index_file = _local_path(root, _MIRROR_INDEX_MAP_PATH)
+    with _metadata_lock:
+        _write_json(index_file, CorrettoClient.load_index_map(client.index_map_url))
+
+
+def _mirror_zulu(
+    client: ZuluClient, download_url: str, root: str, archive_file: str
+) -> None:
+    bundle_path = mirror_bundle_path(client.bundle_query(download_url))
+    bundle_file = _local_path(root, bundle_path)
+    # Relative links keep the mirror valid wherever it is served from
+    archive_path = ospath.relpath(archive_file, root).replace(ospath.sep, "/")
+    bundle = {
+        "url": posixpath.relpath(archive_path, posixpath.dirname(bundle_path)),
+        "sha256_hash": client.get_checksum(download_url),
+        "size": ospath.getsize(archive_file),
+    }
+    _write_json(bundle_file, bundle)
+
+
+def _mirror_build(
+    directory: str,
+    vendor: Union[Vendor, str],
+    version: str,
+    operating_system: Union[OperatingSystem, str],
+    arch: Union[Architecture, str],
+    jre: bool,
+) -> str:
+    client_class = load_client(vendor)
+    if client_class is None:
+        raise MirrorError(f"Unknown vendor {vendor}")
+
+    client = client_class()
+    if not isinstance(client, (AdoptiumClient, CorrettoClient, ZuluClient)):
+        raise MirrorError(f"Mirroring is not supported for {vendor}")
+
+    root = ospath.join(directory, _vendor_path(client_class))
+    download_url = client.get_download_url(version, operating_system, arch, jre=jre)
+    archive_file = _archive_path(client, download_url, root)
+
+    if isinstance(client, AdoptiumClient):
+        checksum = _mirror_adoptium(client, download_url, root)
+        _fetch_archive(client, download_url, checksum, archive_file)
+    elif isinstance(client, CorrettoClient):
+        _mirror_corretto(client, download_url, root)
+        checksum = client.get_checksum(download_url)
+        _fetch_archive(client, download_url, checksum, archive_file)
+    else:
+        checksum = client.get_checksum(download_url)
+        _fetch_archive(client, download_url, checksum, archive_file)
+        _mirror_zulu(client, download_url, root, archive_file)
+
+    return archive_file
+
+
+def mirror(
+    directory: str,
+    versions: Iterable[str],
+    vendors: Iterable[Union[Vendor, str]] = ("Adoptium",),
+    operating_systems: Optional[Iterable[Union[OperatingSystem, str]]] = None,
+    architectures: Optional[Iterable[Union[Architecture, str]]] = None,
+    jre: bool = False,
+    max_workers: Optional[int] = None,
+) -> List[MirrorEntry]:
+    directory = ospath.abspath(directory)
+    matrix = build_matrix(versions, vendors, operating_systems, architectures, jre)
+    builds = run_matrix(partial(_mirror_build, directory), matrix, max_workers)
+    return [MirrorEntry(*build, path, error) for build, path, error in builds]
@@ -0,0 +1,108 @@
+import os
+import time
+from collections import namedtuple
+from functools import partial
+from typing import Any
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+from jdk.cache import ArchiveCache
+from jdk.client.client import create_client
+from jdk.enums import Architecture
+from jdk.enums import OperatingSystem
+from jdk.enums import Vendor
+from jdk.matrix import build_matrix
+from jdk.matrix import run_matrix
+
+
+# Matches the metadata TTL, so each round can see newly published builds
+DEFAULT_INTERVAL = 60 * 60
+
+# Linux derives a process's I/O priority from its nice value unless one is set
+_NICENESS = 10
+
+
+PrefetchEntry = namedtuple(
+    "PrefetchEntry",
+    "vendor version operating_system arch jre url checksum path fetched error",
+)
+
+
+class PrefetchError(Exception):
+    pass
+
+
+def lower_priority() -> None:
+    if hasattr(os, "nice"):
+        try:
+            os.nice(_NICENESS)
+        except OSError:
+            pass
+
+
+def _prefetch_build(
+    cache: ArchiveCache,
+    mirror: Optional[str],
+    vendor: Union[Vendor, str],
+    version: str,
+    operating_system: OperatingSystem,
+    arch: Architecture,
+    jre: bool,
+) -> Tuple[str, Optional[str], str, bool]:
+    client = create_client(vendor, mirror)
+    # Resolved as install() resolves it, so the install finds the same cache entry
+    download_url = client.get_download_url(version, operating_system, arch, jre=jre)
+    checksum = client.get_checksum(download_url)
+
+    cached = cache.get(download_url, checksum)
+    if cached:
+        return download_url, checksum, cached, False
+
+    jdk_file = client.download(download_url, cache=cache, checksum=checksum)
+    return download_url, checksum, jdk_file, True
+
+
+def prefetch(
+    versions: Iterable[str],
+    vendors: Iterable[Union[Vendor, str]] = ("Adoptium",),
+    operating_systems: Optional[Iterable[Union[OperatingSystem, str]]] = None,
+    architectures: Optional[Iterable[Union[Architecture, str]]] = None,
+    jre: bool = False,
+    *,
+    cache: Optional[ArchiveCache] = None,
+    mirror: Optional[str] = None,
+    max_workers: Optional[int] = None,
+) -> List[PrefetchEntry]:
+    cache = cache or ArchiveCache()
+    matrix = build_matrix(versions, vendors, operating_systems, architectures, jre)
+    builds = run_matrix(partial(_prefetch_build, cache, mirror), matrix, max_workers)
+
+    entries = []
+    for build, fetched, error in builds:
+        if error is None:
+            entries.append(PrefetchEntry(*build, *fetched, None))
+        else:
+            entries.append(PrefetchEntry(*build, None, None, None, False, error))
+    return entries
+
+
+def watch(
+    versions: Iterable[str],
+    *args: Any,
+    interval: float = DEFAULT_INTERVAL,
+    rounds: Optional[int] = None,
+    **kwargs: Any,
+) -> Iterator[List[PrefetchEntry]]:
+    versions = list(versions)
+    completed = 0
+    while True:
+        # A build whose URL or checksum changed misses the cache and is downloaded
+        yield prefetch(versions, *args, **kwargs)
+        completed += 1
+        if rounds is not None and completed >= rounds:
+            return
+        time.sleep(interval)
@@ -0,0 +1,119 @@
+import time
+from collections import namedtuple
+from threading import Event
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import Optional
+from typing import Union
+
+from jdk.client.client import create_client
+from jdk.enums import Architecture
+from jdk.enums import JvmImpl
+from jdk.enums import OperatingSystem
+from jdk.enums import Vendor
+
+
+RACE_VENDOR = "fastest"
+DEFAULT_VENDORS = ("Adoptium", "Corretto", "Zulu")
+
+# Enough of the archive to measure throughput without paying for the whole download
+_PROBE_SIZE = 256 * 1024
+_CHUNK_SIZE = 64 * 1024
+
+
+RaceResult = namedtuple("RaceResult", "vendor client url ttfb elapsed")
+
+
+class RaceError(Exception):
+    def __init__(self, errors: Dict[str, Exception]) -> None:
+        details = ", ".join(f"{vendor}: {error}" for vendor, error in errors.items())
+        super().__init__(f"No vendor could serve the build ({details})")
+        self.errors = errors
+
+
+def is_race(vendor: Optional[Union[Vendor, str]]) -> bool:
+    return isinstance(vendor, str) and vendor.lower() == RACE_VENDOR
+
+
+def _probe(
+    vendor: Union[Vendor, str],
+    version: str,
+    operating_system: Optional[Union[OperatingSystem, str]],
+    arch: Optional[Union[Architecture, str]],
+    impl: Union[JvmImpl, str],
+    jre: bool,
+    mirror: Optional[str],
+    cancelled: Event,
+) -> RaceResult:
+    client = create_client(vendor, mirror)
+    url = client.get_download_url(version, operating_system, arch, impl, jre)
+
+    start = time.monotonic()
+    headers = {"Range": f"bytes=0-{_PROBE_SIZE - 1}"}
+    with client.open(url, headers=headers) as response:
+        ttfb = None
+        received = 0
+        # Servers without range support send the whole archive, so stop at the probe
+        while received < _PROBE_SIZE and not cancelled.is_set():
+            chunk = response.read(min(_CHUNK_SIZE, _PROBE_SIZE - received))
+            if not chunk:
+                break
+            if ttfb is None:
+                ttfb = time.monotonic() - start
+            received += len(chunk)
+
+    return RaceResult(vendor, client, url, ttfb, time.monotonic() - start)
+
+
+def race(
+    version: str,
+    operating_system: Optional[Union[OperatingSystem, str]] = None,
+    arch: Optional[Union[Architecture, str]] = None,
+    impl: Union[JvmImpl, str] = JvmImpl.HOTSPOT,
+    jre: bool = False,
+    *,
+    vendors: Iterable[Union[Vendor, str]] = DEFAULT_VENDORS,
+    mirror: Optional[str] = None,
+    timeout: Optional[float] = None,
+) -> RaceResult:
+    from concurrent.futures import FIRST_COMPLETED
+    from concurrent.futures import ThreadPoolExecutor
+    from concurrent.futures import wait
+
+    vendors = list(vendors)
+    cancelled = Event()
+    build = (version, operating_system, arch, impl, jre)
+    executor = ThreadPoolExecutor(
+        max_workers=len(vendors), thread_name_prefix="jdk-race"
+    )
+    pending = {
+        executor.submit(_probe, vendor, *build, mirror, cancelled): str(vendor)
+        for vendor in vendors
+    }
+
+    errors: Dict[str, Any] = {}
+    deadline = None if timeout is None else time.monotonic() + timeout
+    try:
+        while pending:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                break
+
+            done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                vendor = pending.pop(future)
+                try:
+                    return future.result()
+                except Exception as e:
+                    errors[vendor] = e
+    finally:
+        # The first vendor to finish its probe wins, the others are abandoned
+        cancelled.set()
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+    for vendor in pending.values():
+        errors[vendor] = TimeoutError("Probe timed out")
+    raise RaceError(errors)
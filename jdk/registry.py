@@ -0,0 +1,186 @@
+import json
+import os
+import time
+from collections import namedtuple
+from os import path as ospath
+from threading import RLock
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Union
+
+from jdk.client import load_client
+from jdk.client.client import Client
+from jdk.enums import Architecture
+from jdk.enums import JvmImpl
+from jdk.enums import OperatingSystem
+from jdk.enums import Vendor
+from jdk.filelock import FileLock
+
+
+_REGISTRY_FILE = ".registry.json"
+
+
+InstalledJdk = namedtuple(
+    "InstalledJdk",
+    "version vendor operating_system arch impl jre path size url installed",
+)
+
+
+class RegistryError(Exception):
+    pass
+
+
+def _vendor_name(vendor: Optional[Union[Vendor, str, type]]) -> str:
+    client = vendor if isinstance(vendor, type) else load_client(vendor)
+    if client is not None:
+        # Aliases such as Temurin and Adoptium share one client and one registry key
+        return client.__name__
+    return str(vendor).lower()
+
+
+def _directory_size(directory: str) -> int:
+    size = 0
+    for root, _, files in os.walk(directory):
+        for name in files:
+            file = ospath.join(root, name)
+            if not ospath.islink(file):
+                size += ospath.getsize(file)
+    return size
+
+
+class Registry:
+    def __init__(self, root: str) -> None:
+        self.root = ospath.abspath(root)
+        self._file = ospath.join(self.root, _REGISTRY_FILE)
+        self._lock = RLock()
+        self._file_lock = FileLock(f"{self._file}.lock")
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._mtime = None
+
+    @staticmethod
+    def key(
+        version: str,
+        vendor: Optional[Union[Vendor, str]],
+        operating_system: Union[OperatingSystem, str],
+        arch: Union[Architecture, str],
+        impl: Union[JvmImpl, str] = JvmImpl.HOTSPOT,
+        jre: bool = False,
+    ) -> str:
+        parts = (
+            Client.normalize_version(str(version)),
+            _vendor_name(vendor),
+            str(operating_system).lower(),
+            str(arch).lower(),
+            str(impl).lower(),
+            "jre" if jre else "jdk",
+        )
+        return "/".join(parts)
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            mtime = os.stat(self._file).st_mtime_ns
+        except OSError:
+            self._entries, self._mtime = {}, None
+            return self._entries
+
+        # Only re-read the registry when another install has changed it
+        if mtime != self._mtime:
+            try:
+                with open(self._file) as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError) as e:
+                raise RegistryError(e) from e
+            self._mtime = mtime
+        return self._entries
+
+    def _save(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        os.makedirs(self.root, exist_ok=True)
+        tmp_file = f"{self._file}.{os.getpid()}.tmp"
+        with open(tmp_file, "w") as f:
+            json.dump(entries, f, indent=2, sort_keys=True)
+        os.replace(tmp_file, self._file)
+        self._entries = entries
+        self._mtime = os.stat(self._file).st_mtime_ns
+
+    def find(
+        self,
+        version: str,
+        vendor: Optional[Union[Vendor, str]],
+        operating_system: Union[OperatingSystem, str],
+        arch: Union[Architecture, str],
+        impl: Union[JvmImpl, str] = JvmImpl.HOTSPOT,
+        jre: bool = False,
+    ) -> Optional[InstalledJdk]:
+        key = self.key(version, vendor, operating_system, arch, impl, jre)
+        with self._lock:
+            entry = self._load().get(key)
+        if entry and ospath.isdir(entry["path"]):
+            return InstalledJdk(**entry)
+        return None
+
+    def add(
+        self,
+        version: str,
+        vendor: Optional[Union[Vendor, str]],
+        operating_system: Union[OperatingSystem, str],
+        arch: Union[Architecture, str],
+        impl: Union[JvmImpl, str],
+        jre: bool,
+        path: str,
+        url: Optional[str] = None,
+    ) -> InstalledJdk:
+        installed = InstalledJdk(
+            version=Client.normalize_version(str(version)),
+            vendor=_vendor_name(vendor),
+            operating_system=str(operating_system).lower(),
+            arch=str(arch).lower(),
+            impl=str(impl).lower(),
+            jre=jre,
+            path=ospath.abspath(path),
+            size=_directory_size(path),
+            url=url,
+            installed=time.time(),
+        )
+        key = self.key(version, vendor, operating_system, arch, impl, jre)
+        with self._lock, self._file_lock:
+            entries = dict(self._load())
+            entries[key] = installed._asdict()
+            self._save(entries)
+        return installed
+
+    def remove(self, path: str) -> List[InstalledJdk]:
+        path = ospath.abspath(path)
+        with self._lock, self._file_lock:
+            entries = dict(self._load())
+            matched = [k for k, e in entries.items() if e["path"] == path]
+            removed = [InstalledJdk(**entries.pop(key)) for key in matched]
+            if removed:
+                self._save(entries)
+        return removed
+
+    def prune(self) -> List[InstalledJdk]:
+        with self._lock, self._file_lock:
+            entries = dict(self._load())
+            missing = [k for k, e in entries.items() if not ospath.isdir(e["path"])]
+            removed = [InstalledJdk(**entries.pop(key)) for key in missing]
+            if removed:
+                self._save(entries)
+        return removed
+
+    def entries(self) -> List[InstalledJdk]:
+        with self._lock:
+            return [InstalledJdk(**entry) for entry in self._load().values()]
+
+
+_registries: Dict[str, Registry] = {}
+_registries_lock = RLock()
+
+
+def get_registry(root: str) -> Registry:
+    root = ospath.abspath(root)
+    with _registries_lock:
+        if root not in _registries:
+            _registries[root] = Registry(root)
+        return _registries[root]
@@ -0,0 +1,54 @@
+import io
+import json
+import tarfile
+import unittest
+from hashlib import sha256
+from os import path as ospath
+from typing import Iterable
+from unittest import mock
+
+from jdk.cache import ResolutionCache
+from jdk.client.corretto import _MIRROR_INDEX_MAP_PATH
+from jdk.client.corretto import CorrettoClient
+from tests.server import write_file
+
+
+CORRETTO_LATEST = "/downloads/latest/amazon-corretto-17-x64-linux-jdk.tar.gz"
+
+
+def isolate_caches(test: unittest.TestCase, root: str) -> None:
+    # Test servers reuse ports, so cached metadata from one test could leak into another
+    patchers = [
+        mock.patch("jdk.cache._ARCHIVE_CACHE_DIR", ospath.join(root, "archives")),
+        mock.patch("jdk.cache._METADATA_CACHE_DIR", ospath.join(root, "metadata")),
+        mock.patch("jdk.cache._RESOLUTION_CACHE_DIR", ospath.join(root, "resolutions")),
+        mock.patch("jdk.client.client._resolution_cache", ResolutionCache()),
+        mock.patch.object(CorrettoClient, "_metadata_cache", None),
+        mock.patch.object(CorrettoClient, "_indexes", {}),
+    ]
+    for patcher in patchers:
+        patcher.start()
+        test.addCleanup(patcher.stop)
+
+
+def jdk_archive(names: Iterable[str] = ("jdk-17.0.1/release",)) -> bytes:
+    data = io.BytesIO()
+    with tarfile.open(fileobj=data, mode="w:gz") as tar:
+        for name in names:
+            info = tarfile.TarInfo(name)
+            info.size = len(name)
+            tar.addfile(info, io.BytesIO(name.encode("utf-8")))
+    return data.getvalue()
+
+
+def write_corretto_mirror(
+    directory: str, data: bytes, resource: str = CORRETTO_LATEST
+) -> None:
+    # A Corretto 17 linux x64 build whose index entry points at the latest link
+    corretto_dir = ospath.join(directory, "corretto")
+    write_file(corretto_dir, resource.lstrip("/"), data)
+    build = {"resource": CORRETTO_LATEST, "checksum_sha256": sha256(data).hexdigest()}
+    index_map = {"linux": {"x64": {"jdk": {"17": {"tar.gz": build}}}}}
+    write_file(
+        corretto_dir, _MIRROR_INDEX_MAP_PATH, json.dumps(index_map).encode("utf-8")
+    )
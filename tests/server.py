@@ -0,0 +1,121 @@
+import os
+from contextlib import contextmanager
+from hashlib import sha256
+from http.server import SimpleHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from os import path as ospath
+from threading import Lock
+from threading import Thread
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Tuple
+
+
+class FileServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, directory: str, ranges: bool = True) -> None:
+        super().__init__(("127.0.0.1", 0), FileRequestHandler)
+        self.directory = directory
+        self.ranges = ranges
+        self.redirects: Dict[str, str] = {}
+        self.requests: List[Tuple[str, str, str]] = []
+        self._lock = Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def log(self, method: str, url_path: str, byte_range: str) -> None:
+        with self._lock:
+            self.requests.append((method, url_path, byte_range))
+
+    def requested(self, method: str = "GET") -> List[Tuple[str, str, str]]:
+        with self._lock:
+            return [request for request in self.requests if request[0] == method]
+
+
+class FileRequestHandler(SimpleHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def __init__(self, request, client_address, server: FileServer) -> None:
+        super().__init__(request, client_address, server, directory=server.directory)
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        self._serve(True)
+
+    def do_HEAD(self) -> None:
+        self._serve(False)
+
+    def _serve(self, body: bool) -> None:
+        byte_range = self.headers.get("Range", "")
+        self.server.log(self.command, self.path, byte_range)
+
+        location = self.server.redirects.get(self.path)
+        if location:
+            self.send_response(302)
+            self.send_header("Location", location)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        file = self.translate_path(self.path)
+        if ospath.isdir(file):
+            file = ospath.join(file, "index.html")
+        if not ospath.isfile(file):
+            self.send_error(404)
+            return
+
+        with open(file, "rb") as f:
+            data = f.read()
+
+        start, end = 0, len(data) - 1
+        partial = self.server.ranges and byte_range.startswith("bytes=")
+        if partial:
+            first, _, last = byte_range[len("bytes=") :].partition("-")
+            start = int(first)
+            end = min(int(last), end) if last else end
+            if start >= len(data):
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{len(data)}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+
+        self.send_response(206 if partial else 200)
+        if self.server.ranges:
+            self.send_header("Accept-Ranges", "bytes")
+        if partial:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(data)}")
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(end - start + 1))
+        self.send_header("ETag", f'"{sha256(data).hexdigest()[:16]}"')
+        self.end_headers()
+        if body:
+            self.wfile.write(data[start : end + 1])
+
+
+@contextmanager
+def serve(directory: str, ranges: bool = True) -> Iterator[FileServer]:
+    server = FileServer(directory, ranges)
+    thread = Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+def write_file(directory: str, name: str, data: bytes) -> str:
+    file = ospath.join(directory, name)
+    os.makedirs(ospath.dirname(file), exist_ok=True)
+    with open(file, "wb") as f:
+        f.write(data)
+    return file
@@ -0,0 +1,61 @@
+import asyncio
+import tempfile
+import unittest
+from os import path as ospath
+
+from jdk.client.aio import AsyncClient
+from jdk.enums import Architecture
+from jdk.enums import OperatingSystem
+from jdk.mirror import mirror_client
+from tests.fixtures import isolate_caches
+from tests.fixtures import jdk_archive
+from tests.fixtures import write_corretto_mirror
+from tests.server import serve
+
+
+class AsyncInstallTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tempdir.cleanup)
+        self.root = self._tempdir.name
+        self.mirror_dir = ospath.join(self.root, "mirror")
+        self.path = ospath.join(self.root, "install")
+        write_corretto_mirror(self.mirror_dir, jdk_archive())
+
+        self._saved_tempdir = tempfile.tempdir
+        tempfile.tempdir = self.root
+        self.addCleanup(setattr, tempfile, "tempdir", self._saved_tempdir)
+        isolate_caches(self, self.root)
+
+    def _install(self, server_url: str, **options) -> str:
+        client = AsyncClient(mirror_client("Corretto", server_url), vendor="Corretto")
+        return asyncio.run(
+            client.install(
+                "17",
+                OperatingSystem.LINUX,
+                Architecture.X64,
+                path=self.path,
+                **options,
+            )
+        )
+
+    def test_returns_registered_builds_without_requests(self) -> None:
+        with serve(self.mirror_dir) as server:
+            jdk_dir = self._install(server.url)
+            self.assertTrue(ospath.isfile(ospath.join(jdk_dir, "release")))
+
+            requests = len(server.requests)
+            self.assertEqual(self._install(server.url), jdk_dir)
+            self.assertEqual(len(server.requests), requests)
+
+    def test_rejects_unknown_options(self) -> None:
+        with serve(self.mirror_dir) as server:
+            with self.assertRaises(TypeError):
+                self._install(server.url, summary=True)
+            with self.assertRaises(ValueError):
+                self._install(server.url, include="no-sources")
+            self.assertEqual(server.requests, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
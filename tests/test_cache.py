@@ -0,0 +1,73 @@
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import sha256
+from os import path as ospath
+
+import jdk
+from jdk.cache import ArchiveCache
+from jdk.client.client import Client
+from tests.fixtures import jdk_archive
+from tests.server import write_file
+
+
+_URL = "http://127.0.0.1:9/jdk.tar.gz"
+
+
+class OfflineClient(Client):
+    def get_checksum(self, download_url: str) -> str:
+        raise AssertionError(f"Checksum of {download_url} requested")
+
+
+class ArchiveCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tempdir.cleanup)
+        self.root = self._tempdir.name
+        self.cache_dir = ospath.join(self.root, "archives")
+
+    def _archive(self, name: str, data: bytes) -> str:
+        return write_file(ospath.join(self.root, "downloads"), name, data)
+
+    def test_concurrent_puts_from_separate_caches(self) -> None:
+        files = [self._archive(f"{index}-jdk.tar.gz", b"jdk") for index in range(8)]
+        with ThreadPoolExecutor(max_workers=len(files)) as executor:
+            cached = list(
+                executor.map(
+                    lambda file: ArchiveCache(self.cache_dir).put(_URL, file), files
+                )
+            )
+
+        self.assertEqual(len(cached), len(files))
+        self.assertEqual(len(ArchiveCache(self.cache_dir).entries()), 1)
+        self.assertEqual(
+            os.listdir(self.cache_dir), [sha256(_URL.encode()).hexdigest()]
+        )
+
+    def test_entries_are_keyed_on_the_url(self) -> None:
+        cache = ArchiveCache(self.cache_dir)
+        old = sha256(b"old").hexdigest()
+        cache.put(_URL, self._archive("jdk.tar.gz", b"old"), old)
+        self.assertIsNone(cache.get(_URL, sha256(b"new").hexdigest()))
+        self.assertEqual(cache.lookup(_URL).checksum, old)
+
+        # A newer build behind the same link replaces the old archive
+        new = sha256(b"new").hexdigest()
+        cached = cache.put(_URL, self._archive("jdk.tar.gz", b"new"), new)
+        self.assertEqual(cache.get(_URL, new), cached)
+        self.assertEqual(len(cache.entries()), 1)
+
+    def test_install_from_cache_does_not_request_the_checksum(self) -> None:
+        data = jdk_archive()
+        cache = ArchiveCache(self.cache_dir)
+        checksum = sha256(data).hexdigest()
+        cache.put(_URL, self._archive("jdk.tar.gz", data), checksum)
+
+        install_dir = ospath.join(self.root, "jdks")
+        jdk_dir = jdk._install_url(OfflineClient(None), _URL, install_dir, cache=cache)
+        self.assertTrue(ospath.isfile(ospath.join(jdk_dir, "release")))
+
+
+if __name__ == "__main__":
+    unittest.main()
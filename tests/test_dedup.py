@@ -0,0 +1,51 @@
+import tempfile
+import unittest
+from os import path as ospath
+
+from jdk.dedup import dedupe
+from tests.server import write_file
+
+
+_FILES = {
+    "lib/modules": b"modules",
+    "lib/server/libjvm.so": b"libjvm",
+    "lib/security/cacerts": b"cacerts",
+    "conf/security/java.security": b"java.security",
+    "release": b"JAVA_VERSION=17",
+}
+
+
+class DedupTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tempdir.cleanup)
+        self.root = self._tempdir.name
+        for jdk_dir in ("jdk-a", "jdk-b"):
+            for name, data in _FILES.items():
+                write_file(ospath.join(self.root, jdk_dir), name, data)
+
+    def _shared(self, name: str) -> bool:
+        files = [
+            ospath.join(self.root, jdk_dir, name) for jdk_dir in ("jdk-a", "jdk-b")
+        ]
+        return ospath.samefile(*files)
+
+    def test_hardlinks_only_read_only_files(self) -> None:
+        dedupe(ospath.join(self.root, "jdk-a"), reflink=False)
+        result = dedupe(ospath.join(self.root, "jdk-b"), reflink=False)
+
+        self.assertEqual(result.linked, 2)
+        self.assertTrue(self._shared("lib/modules"))
+        self.assertTrue(self._shared("lib/server/libjvm.so"))
+        for name in ("lib/security/cacerts", "conf/security/java.security", "release"):
+            self.assertFalse(self._shared(name))
+
+        # Editing a file in one install leaves the other untouched
+        with open(ospath.join(self.root, "jdk-b", "lib/security/cacerts"), "wb") as f:
+            f.write(b"edited")
+        with open(ospath.join(self.root, "jdk-a", "lib/security/cacerts"), "rb") as f:
+            self.assertEqual(f.read(), b"cacerts")
+
+
+if __name__ == "__main__":
+    unittest.main()
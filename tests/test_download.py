@@ -0,0 +1,161 @@
+import json
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import sha256
+
+from jdk.client.client import ChecksumError
+from jdk.client.client import Client
+from tests.server import serve
+from tests.server import write_file
+
+
+# Large enough for the range splitter to use four connections
+_ARCHIVE_SIZE = 16 * 1024 * 1024
+
+
+class RangeDownloadTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tempdir.cleanup)
+        self.root = os.path.join(self._tempdir.name, "srv")
+        self.data = os.urandom(_ARCHIVE_SIZE)
+        write_file(self.root, "jdk.tar.gz", self.data)
+
+        # Part files and finished archives stay inside the test directory
+        self._saved_tempdir = tempfile.tempdir
+        tempfile.tempdir = self._tempdir.name
+        self.addCleanup(setattr, tempfile, "tempdir", self._saved_tempdir)
+
+    def _read(self, file: str) -> bytes:
+        with open(file, "rb") as f:
+            return f.read()
+
+    def test_splits_download_into_ranges(self) -> None:
+        with serve(self.root) as server:
+            jdk_file = Client(None).download(f"{server.url}/jdk.tar.gz", connections=4)
+            requests = server.requested("GET")
+
+        self.assertEqual(self._read(jdk_file), self.data)
+        ranges = sorted(byte_range for _, _, byte_range in requests)
+        self.assertEqual(len(ranges), 4)
+        self.assertTrue(all(byte_range.startswith("bytes=") for byte_range in ranges))
+
+    def test_reports_progress_across_ranges(self) -> None:
+        progress = []
+        with serve(self.root) as server:
+            Client(None).download(
+                f"{server.url}/jdk.tar.gz",
+                connections=4,
+                progress=lambda done, total: progress.append((done, total)),
+            )
+
+        self.assertEqual(progress[-1], (_ARCHIVE_SIZE, _ARCHIVE_SIZE))
+
+    def test_falls_back_to_one_stream_without_range_support(self) -> None:
+        with serve(self.root, ranges=False) as server:
+            jdk_file = Client(None).download(f"{server.url}/jdk.tar.gz", connections=4)
+            requests = server.requested("GET")
+
+        self.assertEqual(self._read(jdk_file), self.data)
+        self.assertEqual([byte_range for _, _, byte_range in requests], [""])
+
+    def test_verifies_checksum_of_ranged_download(self) -> None:
+        checksum = sha256(self.data).hexdigest()
+        with serve(self.root) as server:
+            url = f"{server.url}/jdk.tar.gz"
+            jdk_file = Client(None).download(url, checksum=checksum, connections=4)
+            self.assertEqual(self._read(jdk_file), self.data)
+
+            with self.assertRaises(ChecksumError):
+                Client(None).download(url, checksum="0" * 64, connections=4)
+
+    def test_concurrent_downloads_of_one_url_get_their_own_files(self) -> None:
+        with serve(self.root) as server:
+            url = f"{server.url}/jdk.tar.gz"
+            with ThreadPoolExecutor(max_workers=6) as executor:
+                streamed = [
+                    executor.submit(Client(None).download, url) for _ in range(3)
+                ]
+                ranged = [
+                    executor.submit(Client(None).download, url, connections=4)
+                    for _ in range(3)
+                ]
+                files = [future.result() for future in streamed + ranged]
+
+        self.assertEqual(len(set(files)), len(files))
+        for jdk_file in files:
+            self.assertTrue(jdk_file.endswith("jdk.tar.gz"))
+            self.assertEqual(self._read(jdk_file), self.data)
+
+
+class ResumeDownloadTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tempdir.cleanup)
+        self.root = os.path.join(self._tempdir.name, "srv")
+        self.data = os.urandom(1024 * 1024)
+        self.checksum = sha256(self.data).hexdigest()
+        write_file(self.root, "jdk.tar.gz", self.data)
+
+        self._saved_tempdir = tempfile.tempdir
+        tempfile.tempdir = self._tempdir.name
+        self.addCleanup(setattr, tempfile, "tempdir", self._saved_tempdir)
+
+    def _write_part(self, url: str, data: bytes, **state: int) -> str:
+        url_hash = sha256(url.encode("utf-8")).hexdigest()
+        part_file = os.path.join(self._tempdir.name, f"{url_hash}.part")
+        with open(part_file, "wb") as f:
+            f.write(data)
+        state = dict(state, url=url, file_name="jdk.tar.gz", etag='"etag"')
+        with open(f"{part_file}.json", "w") as f:
+            json.dump(state, f)
+        return part_file
+
+    def _download(self, server, data: bytes, **state: int) -> str:
+        url = f"{server.url}/jdk.tar.gz"
+        part_file = self._write_part(url, data, **state)
+        jdk_file = Client(None).download(url, checksum=self.checksum)
+
+        with open(jdk_file, "rb") as f:
+            self.assertEqual(f.read(), self.data)
+        self.assertFalse(os.path.exists(part_file))
+        self.assertFalse(os.path.exists(f"{part_file}.json"))
+        self.assertFalse(os.path.exists(f"{part_file}.lock"))
+        return jdk_file
+
+    def test_finishes_complete_part_without_requests(self) -> None:
+        size = len(self.data)
+        with serve(self.root) as server:
+            self._download(server, self.data, offset=size, size=size)
+            self.assertEqual(server.requested("GET"), [])
+
+    def test_restarts_complete_part_that_fails_checksum(self) -> None:
+        size = len(self.data)
+        with serve(self.root) as server:
+            self._download(server, os.urandom(size), offset=size, size=size)
+            requests = server.requested("GET")
+
+        self.assertEqual([byte_range for _, _, byte_range in requests], [""])
+
+    def test_finishes_part_when_range_is_not_satisfiable(self) -> None:
+        with serve(self.root) as server:
+            self._download(server, self.data, offset=len(self.data))
+            requests = server.requested("GET")
+
+        ranges = [byte_range for _, _, byte_range in requests]
+        self.assertEqual(ranges, [f"bytes={len(self.data)}-"])
+
+    def test_restarts_part_when_range_is_not_satisfiable(self) -> None:
+        size = len(self.data)
+        with serve(self.root) as server:
+            self._download(server, os.urandom(size + 1), offset=size + 1)
+            requests = server.requested("GET")
+
+        ranges = [byte_range for _, _, byte_range in requests]
+        self.assertEqual(ranges, [f"bytes={size + 1}-", ""])
+
+
+if __name__ == "__main__":
+    unittest.main()
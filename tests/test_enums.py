@@ -0,0 +1,37 @@
+import unittest
+
+from jdk.client.adoptium import AdoptiumArchitecture
+from jdk.client.adoptium import AdoptiumClient
+from jdk.client.zulu import ZuluArchitecture
+from jdk.client.zulu import ZuluOperatingSystem
+from jdk.enums import Architecture
+from jdk.enums import OperatingSystem
+
+
+class TransformTest(unittest.TestCase):
+    def test_translates_between_vendors(self) -> None:
+        self.assertIs(
+            ZuluOperatingSystem.transform(OperatingSystem.MAC),
+            ZuluOperatingSystem.MACOS,
+        )
+        self.assertIs(
+            ZuluArchitecture.transform(Architecture.X64), ZuluArchitecture.X86
+        )
+        self.assertIs(
+            AdoptiumArchitecture.transform("aarch64"), AdoptiumArchitecture.AARCH64
+        )
+
+    def test_rejects_unknown_values(self) -> None:
+        with self.assertRaises(ValueError):
+            AdoptiumArchitecture.transform("bogus")
+        with self.assertRaises(ValueError):
+            AdoptiumClient().get_download_url("17", "linux", "bogus")
+
+    def test_membership_and_hash_follow_the_value(self) -> None:
+        self.assertIn(Architecture.X64, AdoptiumArchitecture)
+        self.assertNotIn("bogus", AdoptiumArchitecture)
+        self.assertEqual(hash(Architecture.X64), hash(AdoptiumArchitecture.X64))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import tempfile
+import unittest
+from os import path as ospath
+
+import jdk
+from jdk.enums import Architecture
+from jdk.enums import OperatingSystem
+from jdk.events import END
+from jdk.events import RESOLVE
+from jdk.events import START
+from tests.fixtures import isolate_caches
+from tests.fixtures import jdk_archive
+from tests.fixtures import write_corretto_mirror
+from tests.server import serve
+
+
+class InstallEventsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tempdir.cleanup)
+        self.root = self._tempdir.name
+        write_corretto_mirror(ospath.join(self.root, "mirror"), jdk_archive())
+
+        self._saved_tempdir = tempfile.tempdir
+        tempfile.tempdir = self.root
+        self.addCleanup(setattr, tempfile, "tempdir", self._saved_tempdir)
+        isolate_caches(self, self.root)
+
+    def test_resolve_end_event_carries_the_url(self) -> None:
+        events = []
+        with serve(ospath.join(self.root, "mirror")) as server:
+            summary = jdk.install(
+                "17",
+                OperatingSystem.LINUX,
+                Architecture.X64,
+                path=ospath.join(self.root, "install"),
+                vendor="Corretto",
+                mirror=server.url,
+                events=events.append,
+                summary=True,
+            )
+
+        resolve = [event for event in events if event.phase == RESOLVE]
+        self.assertEqual([event.status for event in resolve], [START, END])
+        self.assertIsNone(resolve[0].url)
+        self.assertEqual(resolve[1].url, summary.url)
+        self.assertTrue(summary.url.startswith(server.url))
+        for event in events[len(resolve) :]:
+            self.assertEqual(event.url, summary.url)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import io
+import tarfile
+import tempfile
+import unittest
+from os import path as ospath
+
+from jdk import extractor
+from jdk.extractor import ExtractorError
+
+
+def _add_file(tar: tarfile.TarFile, name: str, data: bytes) -> None:
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    tar.addfile(info, io.BytesIO(data))
+
+
+def _add_link(tar: tarfile.TarFile, name: str, target: str, kind: bytes) -> None:
+    info = tarfile.TarInfo(name)
+    info.type = kind
+    info.linkname = target
+    tar.addfile(info)
+
+
+class TarLinkTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tempdir.cleanup)
+        self.root = self._tempdir.name
+
+    def _archive(self, link: str, target: str, kind: bytes = tarfile.SYMTYPE) -> str:
+        archive = ospath.join(self.root, "jdk.tar.gz")
+        with tarfile.open(archive, "w:gz") as tar:
+            _add_file(tar, "jdk/lib/modules", b"modules")
+            _add_link(tar, link, target, kind)
+        return archive
+
+    def _extract(self, archive: str, workers: int) -> str:
+        destination = tempfile.mkdtemp(dir=self.root)
+        return extractor.extract_files(archive, ".tar.gz", destination, workers=workers)
+
+    def test_extracts_links_within_the_archive(self) -> None:
+        archive = self._archive("jdk/bin/modules", "../lib/modules")
+        for workers in (1, 4):
+            jdk_dir = self._extract(archive, workers)
+            link = ospath.join(jdk_dir, "bin", "modules")
+            self.assertTrue(ospath.islink(link))
+            with open(link, "rb") as f:
+                self.assertEqual(f.read(), b"modules")
+
+    def test_rejects_symlinks_outside_the_destination(self) -> None:
+        for target in ("../../../etc/passwd", "/etc/passwd"):
+            archive = self._archive("jdk/bin/passwd", target)
+            for workers in (1, 4):
+                with self.assertRaises(ExtractorError):
+                    self._extract(archive, workers)
+
+    def test_rejects_hardlinks_outside_the_destination(self) -> None:
+        archive = self._archive("jdk/bin/passwd", "../etc/passwd", tarfile.LNKTYPE)
+        for workers in (1, 4):
+            with self.assertRaises(ExtractorError):
+                self._extract(archive, workers)
+
+    def test_rejects_members_inside_symlinked_directories(self) -> None:
+        archive = ospath.join(self.root, "jdk.tar.gz")
+        with tarfile.open(archive, "w:gz") as tar:
+            real = tarfile.TarInfo("jdk/real")
+            real.type = tarfile.DIRTYPE
+            tar.addfile(real)
+            _add_link(tar, "jdk/lib", "real", tarfile.SYMTYPE)
+            _add_file(tar, "jdk/lib/modules", b"modules")
+        for workers in (1, 4):
+            with self.assertRaises(ExtractorError):
+                self._extract(archive, workers)
+
+    def test_rejects_symlinks_replacing_directories(self) -> None:
+        archive = self._archive("jdk/lib", "../bin")
+        for workers in (1, 4):
+            with self.assertRaises(ExtractorError):
+                self._extract(archive, workers)
+
+    def test_rejects_links_resolved_through_other_links(self) -> None:
+        archive = ospath.join(self.root, "jdk.tar.gz")
+        with tarfile.open(archive, "w:gz") as tar:
+            _add_file(tar, "jdk/release", b"JAVA_VERSION=17")
+            _add_link(tar, "jdk/here", ".", tarfile.SYMTYPE)
+            _add_link(tar, "jdk/up", "here/../..", tarfile.SYMTYPE)
+        for workers in (1, 4):
+            with self.assertRaises(ExtractorError):
+                self._extract(archive, workers)
+
+
+if __name__ == "__main__":
+    unittest.main()
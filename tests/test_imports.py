@@ -0,0 +1,50 @@
+import json
+import subprocess
+import sys
+import unittest
+
+
+# Modules that import jdk must not load until they are used
+_LAZY_MODULES = (
+    "bz2",
+    "concurrent.futures",
+    "http.client",
+    "inspect",
+    "jdk.client.adoptium",
+    "jdk.client.corretto",
+    "jdk.client.zulu",
+    "jdk.dedup",
+    "jdk.lockfile",
+    "jdk.race",
+    "jdk.registry",
+    "lzma",
+    "platform",
+    "shutil",
+    "subprocess",
+    "tarfile",
+    "tempfile",
+    "urllib.request",
+    "zipfile",
+)
+
+
+def _loaded_after(statement: str) -> list:
+    code = f"import json, sys; {statement}; print(json.dumps(sorted(sys.modules)))"
+    output = subprocess.check_output([sys.executable, "-c", code])
+    return json.loads(output)
+
+
+class ImportTest(unittest.TestCase):
+    def test_import_jdk_defers_heavy_modules(self) -> None:
+        loaded = set(_loaded_after("import jdk"))
+        self.assertEqual(sorted(loaded.intersection(_LAZY_MODULES)), [])
+
+    def test_load_client_imports_only_the_requested_vendor(self) -> None:
+        loaded = set(_loaded_after("import jdk; jdk.load_client('Corretto')"))
+        self.assertIn("jdk.client.corretto", loaded)
+        self.assertNotIn("jdk.client.adoptium", loaded)
+        self.assertNotIn("jdk.client.zulu", loaded)
+
+
+if __name__ == "__main__":
+    unittest.main()
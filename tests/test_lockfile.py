@@ -0,0 +1,79 @@
+import tempfile
+import unittest
+from os import path as ospath
+
+import jdk
+from jdk.enums import Architecture
+from jdk.enums import OperatingSystem
+from jdk.lockfile import Lockfile
+from jdk.lockfile import LockfileError
+from tests.fixtures import CORRETTO_LATEST
+from tests.fixtures import isolate_caches
+from tests.fixtures import jdk_archive
+from tests.fixtures import write_corretto_mirror
+from tests.server import serve
+
+
+_RESOURCE = "/downloads/resources/17.0.1/amazon-corretto-17.0.1-linux-x64.tar.gz"
+_SPEC = {
+    "version": "17",
+    "vendor": "Corretto",
+    "operating_system": OperatingSystem.LINUX,
+    "arch": Architecture.X64,
+}
+
+
+class LockTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tempdir.cleanup)
+        self.root = self._tempdir.name
+        self.mirror_dir = ospath.join(self.root, "mirror")
+
+        self.data = jdk_archive()
+        write_corretto_mirror(self.mirror_dir, self.data, _RESOURCE)
+
+        self._saved_tempdir = tempfile.tempdir
+        tempfile.tempdir = self.root
+        self.addCleanup(setattr, tempfile, "tempdir", self._saved_tempdir)
+        isolate_caches(self, self.root)
+
+    def test_pins_the_build_a_latest_link_redirects_to(self) -> None:
+        with serve(self.mirror_dir) as server:
+            server.redirects[f"/corretto{CORRETTO_LATEST}"] = f"/corretto{_RESOURCE}"
+            (build,) = jdk.lock([_SPEC], mirror=server.url).builds
+
+            self.assertEqual(build.url, f"{server.url}/corretto{_RESOURCE}")
+            self.assertEqual(build.size, len(self.data))
+
+            del server.redirects[f"/corretto{CORRETTO_LATEST}"]
+            (result,) = jdk.install_from_lock(
+                Lockfile([build]), path=ospath.join(self.root, "install")
+            )
+            self.assertIsNone(result.error)
+            self.assertTrue(ospath.isfile(ospath.join(result.path, "release")))
+
+    def test_does_not_pin_signed_redirects(self) -> None:
+        with serve(self.mirror_dir) as server:
+            server.redirects[
+                f"/corretto{CORRETTO_LATEST}"
+            ] = f"/corretto{_RESOURCE}?sig=1"
+            (build,) = jdk.lock([_SPEC], mirror=server.url).builds
+
+        self.assertEqual(build.url, f"{server.url}/corretto{CORRETTO_LATEST}")
+
+    def test_rejects_archives_that_differ_from_the_locked_size(self) -> None:
+        with serve(self.mirror_dir) as server:
+            server.redirects[f"/corretto{CORRETTO_LATEST}"] = f"/corretto{_RESOURCE}"
+            (build,) = jdk.lock([_SPEC], mirror=server.url).builds
+            lockfile = Lockfile([build._replace(size=build.size + 1)])
+
+            for stream in (False, True):
+                (result,) = jdk.install_from_lock(
+                    lockfile, path=ospath.join(self.root, "install"), stream=stream
+                )
+                self.assertIsInstance(result.error.__cause__, LockfileError)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,178 @@
+import json
+import os
+import tempfile
+import unittest
+from hashlib import sha256
+from os import path as ospath
+from unittest import mock
+from urllib.parse import urlsplit
+
+import jdk
+from jdk import JdkError
+from jdk.client import load_client
+from jdk.enums import Architecture
+from jdk.enums import OperatingSystem
+from jdk.mirror import _vendor_path
+from jdk.mirror import mirror
+from tests.fixtures import isolate_caches
+from tests.fixtures import jdk_archive
+from tests.server import serve
+from tests.server import write_file
+
+
+_VENDORS = ("Adoptium", "Corretto", "Zulu")
+
+
+def _upstream_client(upstream_url: str):
+    def load(vendor):
+        client_class = load_client(vendor)
+
+        class UpstreamClient(client_class):
+            def __init__(self) -> None:
+                super().__init__(f"{upstream_url}/{_vendor_path(client_class)}")
+
+        UpstreamClient.__name__ = client_class.__name__
+        return UpstreamClient
+
+    return load
+
+
+class MirrorTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tempdir.cleanup)
+        self.root = self._tempdir.name
+        self.upstream_dir = ospath.join(self.root, "upstream")
+        self.mirror_dir = ospath.join(self.root, "mirror")
+        self.data = jdk_archive()
+        self.checksum = sha256(self.data).hexdigest()
+
+        self._saved_tempdir = tempfile.tempdir
+        tempfile.tempdir = self.root
+        self.addCleanup(setattr, tempfile, "tempdir", self._saved_tempdir)
+        isolate_caches(self, self.root)
+
+    def _write_upstream(self, url: str) -> None:
+        adoptium = "adoptium/v3"
+        write_file(
+            self.upstream_dir,
+            f"{adoptium}/binary/latest/17/ga/linux/x64/jdk/hotspot/normal/eclipse",
+            self.data,
+        )
+        asset = {
+            "vendor": "eclipse",
+            "binary": {
+                "architecture": "x64",
+                "os": "linux",
+                "image_type": "jdk",
+                "heap_size": "normal",
+                "package": {
+                    "name": "OpenJDK17U-jdk_x64_linux.tar.gz",
+                    "checksum": self.checksum,
+                },
+            },
+        }
+        assets = json.dumps([asset]).encode("utf-8")
+        write_file(self.upstream_dir, f"{adoptium}/assets/latest/17/hotspot", assets)
+
+        resource = "/downloads/latest/amazon-corretto-17-x64-linux-jdk.tar.gz"
+        write_file(self.upstream_dir, f"corretto{resource}", self.data)
+        index_map = {
+            "linux": {
+                "x64": {
+                    "jdk": {
+                        "17": {
+                            "tar.gz": {
+                                "resource": resource,
+                                "checksum_sha256": self.checksum,
+                            }
+                        }
+                    }
+                }
+            }
+        }
+        write_file(
+            self.upstream_dir,
+            "corretto-index.json",
+            json.dumps(index_map).encode("utf-8"),
+        )
+
+        write_file(self.upstream_dir, "zulu/cdn/zulu17-linux_x64.tar.gz", self.data)
+        bundle = {
+            "url": f"{url}/zulu/cdn/zulu17-linux_x64.tar.gz",
+            "sha256_hash": self.checksum,
+        }
+        # The static server answers every bundle query with the directory index
+        write_file(
+            self.upstream_dir,
+            "zulu/bundles/latest/index.html",
+            json.dumps(bundle).encode("utf-8"),
+        )
+
+    def _mirror(self, upstream_url: str):
+        with mock.patch("jdk.mirror.load_client", _upstream_client(upstream_url)):
+            with mock.patch(
+                "jdk.client.corretto._INDEX_MAP_URL",
+                f"{upstream_url}/corretto-index.json",
+            ):
+                return mirror(
+                    self.mirror_dir,
+                    ["17"],
+                    _VENDORS,
+                    [OperatingSystem.LINUX],
+                    [Architecture.X64],
+                )
+
+    def _install(self, vendor: str, mirror_url: str) -> str:
+        return jdk.install(
+            "17",
+            OperatingSystem.LINUX,
+            Architecture.X64,
+            path=ospath.join(self.root, "install", vendor),
+            vendor=vendor,
+            mirror=mirror_url,
+        )
+
+    def test_installs_every_vendor_from_the_mirror(self) -> None:
+        with serve(self.upstream_dir) as upstream:
+            self._write_upstream(upstream.url)
+            entries = self._mirror(upstream.url)
+
+        self.assertEqual([entry.error for entry in entries], [None] * len(_VENDORS))
+        with serve(self.mirror_dir) as server:
+            for vendor in _VENDORS:
+                jdk_dir = self._install(vendor, server.url)
+                self.assertTrue(ospath.isfile(ospath.join(jdk_dir, "release")))
+
+    def test_skips_archives_already_mirrored(self) -> None:
+        with serve(self.upstream_dir) as upstream:
+            self._write_upstream(upstream.url)
+            self._mirror(upstream.url)
+            downloads = len(upstream.requested("GET"))
+            entries = self._mirror(upstream.url)
+            archives = [
+                url_path
+                for _, url_path, _ in upstream.requested("GET")[downloads:]
+                if urlsplit(url_path).path.endswith((".tar.gz", "/eclipse"))
+            ]
+
+        self.assertEqual([entry.error for entry in entries], [None] * len(_VENDORS))
+        self.assertEqual(archives, [])
+
+    def test_rejects_tampered_mirror_archives(self) -> None:
+        with serve(self.upstream_dir) as upstream:
+            self._write_upstream(upstream.url)
+            entries = self._mirror(upstream.url)
+
+        for entry in entries:
+            with open(entry.path, "wb") as f:
+                f.write(os.urandom(len(self.data)))
+
+        with serve(self.mirror_dir) as server:
+            for vendor in _VENDORS:
+                with self.assertRaises(JdkError):
+                    self._install(vendor, server.url)
+
+
+if __name__ == "__main__":
+    unittest.main()
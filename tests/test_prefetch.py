@@ -0,0 +1,115 @@
+import tempfile
+import unittest
+from os import path as ospath
+
+import jdk
+from jdk.cache import ArchiveCache
+from jdk.enums import Architecture
+from jdk.enums import OperatingSystem
+from jdk.prefetch import prefetch
+from jdk.prefetch import watch
+from tests.fixtures import CORRETTO_LATEST
+from tests.fixtures import isolate_caches
+from tests.fixtures import jdk_archive
+from tests.fixtures import write_corretto_mirror
+from tests.server import serve
+
+
+_ARCHIVE_PATH = f"/corretto{CORRETTO_LATEST}"
+
+
+class PrefetchTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tempdir.cleanup)
+        self.root = self._tempdir.name
+        self.mirror_dir = ospath.join(self.root, "mirror")
+        write_corretto_mirror(self.mirror_dir, jdk_archive())
+
+        self._saved_tempdir = tempfile.tempdir
+        tempfile.tempdir = self.root
+        self.addCleanup(setattr, tempfile, "tempdir", self._saved_tempdir)
+        # Prefetch and install share the default archive cache, kept under root
+        isolate_caches(self, self.root)
+
+    def _prefetch(self, mirror_url: str, vendors=("Corretto",), **kwargs):
+        return prefetch(
+            ["17"],
+            vendors,
+            [OperatingSystem.LINUX],
+            [Architecture.X64],
+            mirror=mirror_url,
+            **kwargs,
+        )
+
+    def _downloads(self, server) -> int:
+        return [path for _, path, _ in server.requested("GET")].count(_ARCHIVE_PATH)
+
+    def test_downloads_missing_builds_once(self) -> None:
+        with serve(self.mirror_dir) as server:
+            (entry,) = self._prefetch(server.url)
+            self.assertIsNone(entry.error)
+            self.assertTrue(entry.fetched)
+            self.assertTrue(ospath.isfile(entry.path))
+
+            (entry,) = self._prefetch(server.url)
+            self.assertFalse(entry.fetched)
+            self.assertEqual(self._downloads(server), 1)
+
+    def test_watch_yields_each_round(self) -> None:
+        with serve(self.mirror_dir) as server:
+            rounds = list(
+                watch(
+                    ["17"],
+                    ["Corretto"],
+                    [OperatingSystem.LINUX],
+                    [Architecture.X64],
+                    mirror=server.url,
+                    interval=0,
+                    rounds=2,
+                )
+            )
+
+        self.assertEqual(
+            [[e.fetched for e in entries] for entries in rounds], [[True], [False]]
+        )
+
+    def test_reports_unknown_vendors_per_build(self) -> None:
+        with serve(self.mirror_dir) as server:
+            entries = self._prefetch(server.url, vendors=("Corretto", "bogus"))
+
+        self.assertIsNone(entries[0].error)
+        self.assertIn("Unknown vendor bogus", str(entries[1].error))
+
+    def test_default_install_uses_the_prefetched_archive(self) -> None:
+        with serve(self.mirror_dir) as server:
+            (entry,) = self._prefetch(server.url)
+            jdk_dir = jdk.install(
+                "17",
+                OperatingSystem.LINUX,
+                Architecture.X64,
+                path=ospath.join(self.root, "install"),
+                vendor="Corretto",
+                mirror=server.url,
+            )
+            self.assertEqual(self._downloads(server), 1)
+
+        self.assertTrue(ospath.isfile(ospath.join(jdk_dir, "release")))
+        self.assertEqual(ArchiveCache().get(entry.url, entry.checksum), entry.path)
+
+    def test_default_install_does_not_fill_the_cache(self) -> None:
+        with serve(self.mirror_dir) as server:
+            jdk.install(
+                "17",
+                OperatingSystem.LINUX,
+                Architecture.X64,
+                path=ospath.join(self.root, "install"),
+                vendor="Corretto",
+                mirror=server.url,
+            )
+
+        self.assertEqual(ArchiveCache().entries(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import os
+import tempfile
+import unittest
+from os import path as ospath
+
+import jdk
+from jdk.enums import Architecture
+from jdk.enums import OperatingSystem
+from tests.fixtures import isolate_caches
+from tests.fixtures import jdk_archive
+from tests.fixtures import write_corretto_mirror
+from tests.server import serve
+
+
+class FilteredInstallTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tempdir.cleanup)
+        self.root = self._tempdir.name
+        self.path = ospath.join(self.root, "install")
+
+        data = jdk_archive(("jdk-17.0.1/bin/java", "jdk-17.0.1/lib/modules"))
+        write_corretto_mirror(ospath.join(self.root, "mirror"), data)
+
+        self._saved_tempdir = tempfile.tempdir
+        tempfile.tempdir = self.root
+        self.addCleanup(setattr, tempfile, "tempdir", self._saved_tempdir)
+        isolate_caches(self, self.root)
+
+    def _install(self, mirror_url: str, **options) -> str:
+        return jdk.install(
+            "17",
+            OperatingSystem.LINUX,
+            Architecture.X64,
+            path=self.path,
+            vendor="Corretto",
+            mirror=mirror_url,
+            **options,
+        )
+
+    def test_filtered_install_does_not_satisfy_a_full_install(self) -> None:
+        with serve(ospath.join(self.root, "mirror")) as server:
+            jdk_dir = self._install(server.url, include="bin")
+            self.assertEqual(os.listdir(jdk_dir), ["bin"])
+            self.assertEqual(jdk.list_installed(path=self.path), [])
+
+            jdk_dir = self._install(server.url)
+            self.assertEqual(sorted(os.listdir(jdk_dir)), ["bin", "lib"])
+
+    def test_filtered_install_unregisters_the_build_it_replaces(self) -> None:
+        with serve(ospath.join(self.root, "mirror")) as server:
+            self._install(server.url)
+            self.assertEqual(len(jdk.list_installed(path=self.path)), 1)
+
+            self._install(server.url, exclude="lib")
+            self.assertEqual(jdk.list_installed(path=self.path), [])
+
+            downloads = len(server.requested("GET"))
+            jdk_dir = self._install(server.url)
+            self.assertGreater(len(server.requested("GET")), downloads)
+            self.assertEqual(sorted(os.listdir(jdk_dir)), ["bin", "lib"])
+
+    def test_profiles_only_apply_to_exclude(self) -> None:
+        with serve(ospath.join(self.root, "mirror")) as server:
+            with self.assertRaises(ValueError):
+                self._install(server.url, include="runtime-minimal")
+            with self.assertRaises(ValueError):
+                jdk.install_many(["17"], include=["bin", "no-sources"])
+            self.assertEqual(server.requested("GET"), [])
+
+            jdk_dir = self._install(server.url, exclude="runtime-minimal")
+            self.assertEqual(sorted(os.listdir(jdk_dir)), ["bin", "lib"])
+
+
+if __name__ == "__main__":
+    unittest.main()